@@ -1,9 +1,35 @@
 """
 AHP-TOPSIS Sistem Pengambilan Keputusan Destinasi Wisata
 Main entry point untuk aplikasi.
+
+Jalankan dengan ``--profile-startup[=path.json]`` untuk menulis laporan
+waktu startup (import per modul, konstruksi halaman, init_db).
 """
 
 import sys
+
+# Di-import paling awal: titik nol pengukuran waktu startup
+from gui import startup
+
+PROFILE_FLAG = '--profile-startup'
+
+
+def _profile_path(argv):
+    """Path laporan dari flag ``--profile-startup[=path]``; None jika tidak ada."""
+    for arg in argv:
+        if arg == PROFILE_FLAG:
+            return startup.DEFAULT_REPORT_PATH
+        if arg.startswith(PROFILE_FLAG + '='):
+            return arg.split('=', 1)[1] or startup.DEFAULT_REPORT_PATH
+    return None
+
+
+# Hook import dipasang sebelum PyQt dan halaman di-import
+_PROFILE_PATH = _profile_path(sys.argv[1:])
+if _PROFILE_PATH:
+    startup.enable_profiling(_PROFILE_PATH)
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication
 
 from gui.main_window import MainWindow
@@ -11,8 +37,11 @@ from gui.main_window import MainWindow
 
 def main():
     """Initialize and run the application."""
-    app = QApplication(sys.argv)
-    win = MainWindow()
+    argv = [arg for arg in sys.argv if not arg.startswith(PROFILE_FLAG)]
+    with startup.phase('QApplication'):
+        app = QApplication(argv)
+    with startup.phase('construct MainWindow'):
+        win = MainWindow()
     win.show()
 
     # Show results page when results tab is selected
@@ -25,7 +54,13 @@ def main():
             pass
 
     win.sidebar.currentRowChanged.connect(on_tab_change)
-    sys.exit(app.exec_())
+    QTimer.singleShot(0, lambda: startup.mark('event_loop'))
+    code = app.exec_()
+    if startup.profiling_enabled():
+        # Tulis ulang agar halaman yang dibuka setelah startup ikut tercatat
+        path = startup.write_report()
+        print(f'Laporan startup ditulis ke {path}', file=sys.stderr)
+    sys.exit(code)
 
 
 if __name__ == '__main__':
@@ -4,20 +4,46 @@ Core modules untuk AHP-TOPSIS calculation dan database management.
 
 from core.ahp import normalize_weights
 from core.database import (
-    init_db, save_wisata_rows, load_wisata_db, reset_wisata_table,
-    save_user_location, load_user_location
+    init_db, get_connection, close_connections, save_wisata_rows, upsert_wisata_rows,
+    load_wisata_db, load_wisata_columns, get_catalog, dataset_version, wisata_version,
+    fetch_wisata_page, iter_wisata_batches, reset_wisata_table, delete_wisata_in_bbox,
+    delete_wisata_created_between, delete_wisata_batch, save_user_location,
+    load_user_location, save_user_profile, save_user_profiles, load_user_profile,
+    load_user_profiles, delete_user_profile
 )
 from core.topsis import topsis_rank
-from core.haversine import haversine_km
+from core.haversine import haversine_km, haversine_km_array
+from core.catalog import Catalog
+from core.ranking import rank_catalog
 
 __all__ = [
     'normalize_weights',
     'init_db',
+    'get_connection',
+    'close_connections',
     'save_wisata_rows',
+    'upsert_wisata_rows',
     'load_wisata_db',
+    'load_wisata_columns',
+    'get_catalog',
+    'dataset_version',
+    'wisata_version',
+    'fetch_wisata_page',
+    'iter_wisata_batches',
+    'Catalog',
     'reset_wisata_table',
+    'delete_wisata_in_bbox',
+    'delete_wisata_created_between',
+    'delete_wisata_batch',
     'save_user_location',
     'load_user_location',
+    'save_user_profile',
+    'save_user_profiles',
+    'load_user_profile',
+    'load_user_profiles',
+    'delete_user_profile',
     'topsis_rank',
-    'haversine_km'
+    'rank_catalog',
+    'haversine_km',
+    'haversine_km_array'
 ]
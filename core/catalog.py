@@ -0,0 +1,77 @@
+"""
+Catalog kolom wisata berbasis array NumPy untuk jalur perhitungan ranking.
+"""
+
+import numpy as np
+
+
+# Tipe array untuk setiap kolom tabel wisata
+WISATA_DTYPES = {
+    'id': np.int64,
+    'name': object,
+    'price': np.float64,
+    'rating': np.float64,
+    'rating_count': np.float64,
+    'latitude': np.float64,
+    'longitude': np.float64,
+    'created_at': object,
+}
+
+
+class Catalog:
+    """Kumpulan kolom wisata, satu array NumPy per kolom.
+
+    Pandas hanya dibutuhkan saat data ditampilkan atau diexport melalui
+    :meth:`to_dataframe`.
+    """
+
+    def __init__(self, columns, version=None):
+        self.columns = dict(columns)
+        # Versi tabel wisata saat catalog dimuat (lihat database.wisata_version)
+        self.version = version
+        lengths = {len(arr) for arr in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError('Semua kolom catalog harus memiliki panjang yang sama')
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    @property
+    def names(self):
+        """Nama kolom sesuai urutan pemuatan."""
+        return list(self.columns)
+
+    @property
+    def empty(self):
+        return self._length == 0
+
+    def select(self, columns):
+        """Return a catalog view with only ``columns`` (arrays are shared)."""
+        return Catalog({name: self.columns[name] for name in columns}, version=self.version)
+
+    def take(self, rows):
+        """Return a catalog with only ``rows`` (index array), in that order."""
+        return Catalog(
+            {name: arr[rows] for name, arr in self.columns.items()}, version=self.version
+        )
+
+    def to_dataframe(self, columns=None):
+        """Convert (a subset of) the catalog to a DataFrame for display/export."""
+        import pandas as pd
+
+        names = self.names if columns is None else list(columns)
+        data = {}
+        for name in names:
+            arr = self.columns[name]
+            if arr.dtype.kind == 'S':
+                # Kolom teks dari snapshot disimpan sebagai bytes UTF-8
+                arr = np.char.decode(arr, 'utf-8').astype(object)
+            data[name] = arr
+        return pd.DataFrame(data, columns=names)
@@ -2,22 +2,279 @@
 Database management untuk wisata dan user location data.
 """
 
+import json
 import sqlite3
+import threading
+import time
+import uuid
 from datetime import datetime
+from itertools import repeat
 import os
 
+import numpy as np
 import pandas as pd
 
+from core.catalog import Catalog, WISATA_DTYPES
+from core.snapshot import (
+    SNAPSHOT_COLUMNS, export_snapshot, load_snapshot, read_manifest, snapshot_dir_for
+)
+
 
 DB_FILE = 'wisata_data.db'
 
+# Pragma koneksi. cache_size negatif berarti ukuran dalam KiB (SQLite).
+CACHE_SIZE = -20000
+MMAP_SIZE = 256 * 1024 * 1024
+BUSY_TIMEOUT = 30.0
 
-def init_db(db_path=DB_FILE):
-    """Initialize database tables if they don't exist."""
-    conn = sqlite3.connect(db_path)
+# Jumlah baris per fetchmany() saat mengisi array catalog
+FETCH_BATCH = 10000
+
+# Ukuran halaman default untuk pembacaan bertahap (keyset pagination)
+PAGE_SIZE = 5000
+
+_local = threading.local()
+_epoch_lock = threading.Lock()
+_db_epochs = {}
+
+# Koneksi khusus PRAGMA data_version (tidak pernah menulis) dan cache catalog
+_probe_lock = threading.Lock()
+_probes = {}
+_catalog_lock = threading.Lock()
+_catalog_cache = {}
+
+
+def configure_connections(cache_size=None, mmap_size=None, busy_timeout=None):
+    """Ubah pragma untuk koneksi yang dibuka setelah pemanggilan ini.
+
+    Args:
+        cache_size: Nilai ``PRAGMA cache_size`` (negatif = KiB).
+        mmap_size: Nilai ``PRAGMA mmap_size`` dalam byte.
+        busy_timeout: Lama menunggu lock dalam detik.
+    """
+    global CACHE_SIZE, MMAP_SIZE, BUSY_TIMEOUT
+    if cache_size is not None:
+        CACHE_SIZE = int(cache_size)
+    if mmap_size is not None:
+        MMAP_SIZE = int(mmap_size)
+    if busy_timeout is not None:
+        BUSY_TIMEOUT = float(busy_timeout)
+
+
+def _db_key(db_path):
+    if db_path == ':memory:':
+        return db_path
+    return os.path.abspath(db_path)
+
+
+def _db_epoch(key):
+    with _epoch_lock:
+        return _db_epochs.get(key, 0)
+
+
+def _open_connection(db_path):
+    """Open a new connection with WAL and the tuned pragmas applied."""
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT)
     cur = conn.cursor()
-    
-    # Create wisata table
+    # Hanya berlaku untuk file baru (atau setelah VACUUM); harus sebelum WAL
+    cur.execute('PRAGMA auto_vacuum=INCREMENTAL')
+    cur.execute('PRAGMA journal_mode=WAL')
+    cur.execute('PRAGMA synchronous=NORMAL')
+    cur.execute(f'PRAGMA cache_size={int(CACHE_SIZE)}')
+    cur.execute(f'PRAGMA mmap_size={int(MMAP_SIZE)}')
+    cur.execute('PRAGMA temp_store=MEMORY')
+    cur.close()
+    return conn
+
+
+def get_connection(db_path=DB_FILE):
+    """Return the calling thread's persistent connection for ``db_path``.
+
+    Setiap thread memiliki koneksinya sendiri sehingga pembaca (ranking)
+    tidak pernah berbagi koneksi dengan penulis (ingest); WAL membuat
+    keduanya tidak saling memblokir.
+    """
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+
+    key = _db_key(db_path)
+    epoch = _db_epoch(key)
+    entry = conns.get(key)
+    if entry is not None:
+        conn, conn_epoch = entry
+        if conn_epoch == epoch:
+            return conn
+        # File database sudah dihapus/dibuat ulang sejak koneksi dibuka
+        conn.close()
+
+    conn = _open_connection(db_path)
+    conns[key] = (conn, epoch)
+    return conn
+
+
+def close_connections(db_path=None):
+    """Close the calling thread's cached connections.
+
+    Args:
+        db_path: Tutup hanya koneksi ke file ini; ``None`` menutup semua.
+    """
+    conns = getattr(_local, 'conns', None)
+    if not conns:
+        return
+
+    keys = list(conns) if db_path is None else [_db_key(db_path)]
+    for key in keys:
+        entry = conns.pop(key, None)
+        if entry is not None:
+            entry[0].close()
+
+
+# Presisi koordinat untuk kunci natural (4 desimal ~ 11 meter)
+KEY_COORD_SCALE = 10000
+
+UPSERT_WISATA_SQL = '''
+    INSERT INTO wisata (
+        name, price, rating, rating_count, latitude, longitude, created_at,
+        name_key, lat_key, lon_key, batch_id, row_hash
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (name_key, lat_key, lon_key) DO UPDATE SET
+        name = excluded.name,
+        price = excluded.price,
+        rating = excluded.rating,
+        rating_count = excluded.rating_count,
+        latitude = excluded.latitude,
+        longitude = excluded.longitude,
+        batch_id = excluded.batch_id,
+        row_hash = excluded.row_hash
+    WHERE wisata.row_hash IS NOT excluded.row_hash
+'''
+
+# Kolom yang menentukan isi baris (lihat row_hashes)
+HASH_COLUMNS = ['name', 'price', 'rating', 'rating_count', 'latitude', 'longitude']
+
+
+def normalize_name(name):
+    """Normalisasi nama wisata untuk kunci natural (huruf kecil, spasi tunggal)."""
+    return ' '.join(str(name).split()).casefold()
+
+
+def _coord_key(value):
+    try:
+        return int(round(float(value) * KEY_COORD_SCALE))
+    except (TypeError, ValueError):
+        return None
+
+
+def natural_key(name, lat, lon):
+    """Return the ``(name_key, lat_key, lon_key)`` uniqueness key of a row."""
+    return normalize_name(name), _coord_key(lat), _coord_key(lon)
+
+
+def row_hashes(df):
+    """Hash 64-bit isi setiap baris (nama + nilai numerik float64) sebagai int64.
+
+    Baris yang isinya sama selalu menghasilkan hash yang sama, sehingga
+    perubahan bisa dideteksi tanpa membandingkan kolom satu per satu.
+    """
+    frame = pd.DataFrame({
+        'name': df['name'].astype(object).to_numpy(),
+        **{c: df[c].to_numpy(dtype=np.float64) for c in HASH_COLUMNS[1:]}
+    })
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().view(np.int64)
+
+
+# Versi skema saat ini (disimpan di PRAGMA user_version)
+SCHEMA_VERSION = 5
+
+# Profil yang dipakai GUI (satu user lokal)
+DEFAULT_PROFILE = 'default'
+
+# STRICT tersedia sejak SQLite 3.37; versi lama tetap dijaga oleh CHECK typeof()
+_STRICT = ' STRICT' if sqlite3.sqlite_version_info >= (3, 37, 0) else ''
+
+
+def _table_columns(cur, table):
+    return {row[1] for row in cur.execute(f'PRAGMA table_info({table})')}
+
+
+def _add_natural_key(cur):
+    """Backfill the natural key on a legacy table and drop duplicate rows."""
+    for col, col_type in (('name_key', 'TEXT'), ('lat_key', 'INTEGER'), ('lon_key', 'INTEGER')):
+        cur.execute(f'ALTER TABLE wisata ADD COLUMN {col} {col_type}')
+
+    rows = cur.execute('SELECT id, name, latitude, longitude FROM wisata').fetchall()
+    cur.executemany(
+        'UPDATE wisata SET name_key = ?, lat_key = ?, lon_key = ? WHERE id = ?',
+        ((*natural_key(name, lat, lon), row_id) for row_id, name, lat, lon in rows)
+    )
+
+    # Simpan baris terbaru untuk setiap kunci
+    cur.execute('''
+        DELETE FROM wisata WHERE id NOT IN (
+            SELECT MAX(id) FROM wisata GROUP BY name_key, lat_key, lon_key
+        )
+    ''')
+
+
+def _create_wisata_table(cur, table='wisata'):
+    """Create the typed wisata table (STRICT when supported)."""
+    cur.execute(f'''
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL CHECK (typeof(name) = 'text' AND length(trim(name)) > 0),
+            price REAL NOT NULL CHECK (typeof(price) = 'real' AND price >= 0),
+            rating REAL NOT NULL CHECK (typeof(rating) = 'real' AND rating BETWEEN 0 AND 5),
+            rating_count REAL NOT NULL CHECK (typeof(rating_count) = 'real' AND rating_count >= 0),
+            latitude REAL NOT NULL
+                CHECK (typeof(latitude) = 'real' AND latitude BETWEEN -90 AND 90),
+            longitude REAL NOT NULL
+                CHECK (typeof(longitude) = 'real' AND longitude BETWEEN -180 AND 180),
+            created_at TEXT,
+            name_key TEXT NOT NULL,
+            lat_key INTEGER NOT NULL,
+            lon_key INTEGER NOT NULL,
+            batch_id TEXT,
+            row_hash INTEGER
+        ){_STRICT}
+    ''')
+
+
+def _create_wisata_indexes(cur):
+    cur.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_wisata_natural_key
+        ON wisata (name_key, lat_key, lon_key)
+    ''')
+    if 'batch_id' not in _table_columns(cur, 'wisata'):
+        return
+
+    # Index untuk penghapusan parsial (wilayah, tanggal, batch ingest)
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_wisata_lat_lon ON wisata (latitude, longitude)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_wisata_created_at ON wisata (created_at)')
+    cur.execute('CREATE INDEX IF NOT EXISTS idx_wisata_batch_id ON wisata (batch_id)')
+    if 'row_hash' in _table_columns(cur, 'wisata'):
+        cur.execute('CREATE INDEX IF NOT EXISTS idx_wisata_row_hash ON wisata (row_hash)')
+
+
+def _create_wisata_triggers(cur):
+    # Insert sudah tercatat di sqlite_sequence (AUTOINCREMENT)
+    for event in ('UPDATE', 'DELETE'):
+        cur.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS wisata_after_{event.lower()}
+            AFTER {event} ON wisata
+            BEGIN
+                UPDATE catalog_meta SET value = value + 1 WHERE key = 'wisata_changes';
+            END
+        ''')
+
+
+def _bump_wisata_changes(cur):
+    cur.execute("UPDATE catalog_meta SET value = value + 1 WHERE key = 'wisata_changes'")
+
+
+def _migrate_v1(cur):
+    """Skema dasar: wisata dengan kunci natural, versi dataset, lokasi, cache ranking."""
     cur.execute('''
         CREATE TABLE IF NOT EXISTS wisata (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -27,11 +284,34 @@ def init_db(db_path=DB_FILE):
             rating_count REAL,
             latitude REAL,
             longitude REAL,
-            created_at TEXT
+            created_at TEXT,
+            name_key TEXT,
+            lat_key INTEGER,
+            lon_key INTEGER
+        )
+    ''')
+
+    if 'name_key' not in _table_columns(cur, 'wisata'):
+        _add_natural_key(cur)
+
+    _create_wisata_indexes(cur)
+
+    # Versi dataset: id acak per file DB + penghitung update/delete
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_meta (
+            key TEXT PRIMARY KEY,
+            value
         )
     ''')
-    
-    # Create user_location table
+    cur.execute(
+        "INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('dataset_id', ?)",
+        (uuid.uuid4().hex,)
+    )
+    cur.execute(
+        "INSERT OR IGNORE INTO catalog_meta (key, value) VALUES ('wisata_changes', 0)"
+    )
+    _create_wisata_triggers(cur)
+
     cur.execute('''
         CREATE TABLE IF NOT EXISTS user_location (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -40,49 +320,771 @@ def init_db(db_path=DB_FILE):
             updated_at TEXT
         )
     ''')
-    
-    conn.commit()
-    conn.close()
+
+    # Cache hasil ranking (skor dan rank disimpan sebagai array biner)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS ranking_cache (
+            cache_key TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            scores BLOB NOT NULL,
+            ranks BLOB NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        )
+    ''')
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_ranking_cache_last_used
+        ON ranking_cache (last_used)
+    ''')
 
 
-def save_wisata_rows(rows, db_path=DB_FILE):
-    """Save wisata rows to database."""
-    conn = sqlite3.connect(db_path)
+def _migrate_v2(cur):
+    """Bangun ulang wisata sebagai tabel STRICT dengan NOT NULL/CHECK.
+
+    Baris lama yang tidak bisa dipakai untuk ranking (nilai kosong, bukan
+    angka, atau di luar rentang) tidak ikut dipindahkan; baris tersebut
+    disalin apa adanya ke tabel ``wisata_rejected`` agar bisa diperiksa.
+    """
+    _create_wisata_table(cur, 'wisata_v2')
+    cur.execute('''
+        INSERT INTO wisata_v2 (
+            id, name, price, rating, rating_count, latitude, longitude,
+            created_at, name_key, lat_key, lon_key
+        )
+        SELECT id, name, CAST(price AS REAL), CAST(rating AS REAL),
+               CAST(rating_count AS REAL), CAST(latitude AS REAL),
+               CAST(longitude AS REAL), created_at, name_key, lat_key, lon_key
+        FROM wisata
+        WHERE typeof(name) = 'text' AND length(trim(name)) > 0
+          AND typeof(price) IN ('integer', 'real') AND price >= 0
+          AND typeof(rating) IN ('integer', 'real') AND rating BETWEEN 0 AND 5
+          AND typeof(rating_count) IN ('integer', 'real') AND rating_count >= 0
+          AND typeof(latitude) IN ('integer', 'real') AND latitude BETWEEN -90 AND 90
+          AND typeof(longitude) IN ('integer', 'real') AND longitude BETWEEN -180 AND 180
+          AND name_key IS NOT NULL AND lat_key IS NOT NULL AND lon_key IS NOT NULL
+    ''')
+    rejected = 'FROM wisata WHERE id NOT IN (SELECT id FROM wisata_v2)'
+    if cur.execute(f'SELECT COUNT(*) {rejected}').fetchone()[0]:
+        cur.execute(f'CREATE TABLE IF NOT EXISTS wisata_rejected AS SELECT * {rejected}')
+    cur.execute('DROP TABLE wisata')
+    cur.execute('ALTER TABLE wisata_v2 RENAME TO wisata')
+    _create_wisata_indexes(cur)
+    _create_wisata_triggers(cur)
+    _bump_wisata_changes(cur)
+
+
+def _migrate_v3(cur):
+    """Tambah kolom batch_id dan index untuk penghapusan parsial."""
+    if 'batch_id' not in _table_columns(cur, 'wisata'):
+        cur.execute('ALTER TABLE wisata ADD COLUMN batch_id TEXT')
+    _create_wisata_indexes(cur)
+
+
+def _migrate_v4(cur):
+    """Ganti user_location (satu lokasi global) dengan user_profile per user."""
+    cur.execute(f'''
+        CREATE TABLE IF NOT EXISTS user_profile (
+            profile_id TEXT PRIMARY KEY,
+            latitude REAL CHECK (latitude IS NULL OR latitude BETWEEN -90 AND 90),
+            longitude REAL CHECK (longitude IS NULL OR longitude BETWEEN -180 AND 180),
+            weights TEXT,
+            criteria_plan TEXT,
+            updated_at TEXT NOT NULL
+        ){_STRICT}
+    ''')
+    cur.execute('''
+        CREATE INDEX IF NOT EXISTS idx_user_profile_updated_at
+        ON user_profile (updated_at)
+    ''')
+    cur.execute('''
+        INSERT OR IGNORE INTO user_profile (profile_id, latitude, longitude, updated_at)
+        SELECT ?, CAST(latitude AS REAL), CAST(longitude AS REAL),
+               COALESCE(updated_at, '')
+        FROM user_location
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+        ORDER BY id DESC LIMIT 1
+    ''', (DEFAULT_PROFILE,))
+    cur.execute('DROP TABLE user_location')
+
+
+def _backfill_row_hashes(cur, batch_size=FETCH_BATCH):
+    """Isi row_hash yang masih NULL tanpa menjalankan trigger per baris."""
+    cur.execute('DROP TRIGGER IF EXISTS wisata_after_update')
+    last_id, updated = 0, 0
+    while True:
+        rows = cur.execute(
+            f'SELECT id, {", ".join(HASH_COLUMNS)} FROM wisata '
+            'WHERE row_hash IS NULL AND id > ? ORDER BY id LIMIT ?', (last_id, batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        df = pd.DataFrame(rows, columns=['id'] + HASH_COLUMNS)
+        cur.executemany(
+            'UPDATE wisata SET row_hash = ? WHERE id = ?',
+            zip(row_hashes(df).tolist(), df['id'].tolist())
+        )
+        last_id, updated = rows[-1][0], updated + len(rows)
+    _create_wisata_triggers(cur)
+    if updated:
+        _bump_wisata_changes(cur)
+
+
+def _migrate_v5(cur):
+    """Tambah kolom row_hash (hash isi baris, ber-index) untuk import delta."""
+    if 'row_hash' not in _table_columns(cur, 'wisata'):
+        cur.execute('ALTER TABLE wisata ADD COLUMN row_hash INTEGER')
+    _backfill_row_hashes(cur)
+    _create_wisata_indexes(cur)
+
+
+_MIGRATIONS = [_migrate_v1, _migrate_v2, _migrate_v3, _migrate_v4, _migrate_v5]
+
+
+def init_db(db_path=DB_FILE):
+    """Initialize or migrate the database schema to ``SCHEMA_VERSION``.
+
+    Setiap migrasi dijalankan sekali (dicatat di ``PRAGMA user_version``)
+    di dalam satu transaksi.
+    """
+    conn = get_connection(db_path)
     cur = conn.cursor()
-    
-    for r in rows:
-        cur.execute('''
-            INSERT INTO wisata (name, price, rating, rating_count, latitude, longitude, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            r['name'], 
-            float(r['price']), 
-            float(r['rating']), 
-            float(r['rating_count']), 
-            float(r['latitude']), 
-            float(r['longitude']), 
-            datetime.utcnow().isoformat()
-        ))
-    
-    conn.commit()
-    conn.close()
+    if cur.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+        return
+
+    cur.execute('BEGIN IMMEDIATE')
+    try:
+        # Baca ulang setelah lock; koneksi lain mungkin sudah bermigrasi
+        version = cur.execute('PRAGMA user_version').fetchone()[0]
+        for target, migrate in enumerate(_MIGRATIONS[version:], start=version + 1):
+            migrate(cur)
+            cur.execute(f'PRAGMA user_version = {target}')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def new_batch_id():
+    """Id batch ingest, misal ``20240101T120000-1a2b3c``."""
+    return f'{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}'
+
+
+def upsert_wisata_rows(rows, db_path=DB_FILE, batch_id=None):
+    """Insert or update wisata rows by their natural key.
+
+    Baris dengan nama ternormalisasi dan koordinat (dibulatkan) yang sama
+    memperbarui baris yang sudah ada, bukan menambah duplikat. Baris yang
+    ditambah atau diubah ditandai dengan ``batch_id``.
+
+    Returns:
+        Dict berisi jumlah ``inserted``, ``updated``, ``unchanged`` dan
+        ``batch_id`` yang dipakai.
+    """
+    df = pd.DataFrame(list(rows), columns=HASH_COLUMNS)
+    return upsert_wisata_frames([df], db_path, batch_id=batch_id)
+
+
+def _frame_params(df, now, batch_id):
+    """Parameter upsert untuk DataFrame yang sudah divalidasi dan bertipe float."""
+    names = df['name'].tolist()
+    lat = df['latitude'].to_numpy(dtype=np.float64)
+    lon = df['longitude'].to_numpy(dtype=np.float64)
+    return list(zip(
+        names,
+        df['price'].to_numpy(dtype=np.float64).tolist(),
+        df['rating'].to_numpy(dtype=np.float64).tolist(),
+        df['rating_count'].to_numpy(dtype=np.float64).tolist(),
+        lat.tolist(),
+        lon.tolist(),
+        repeat(now),
+        [normalize_name(n) for n in names],
+        # np.rint membulatkan ke genap seperti round() di _coord_key
+        np.rint(lat * KEY_COORD_SCALE).astype(np.int64).tolist(),
+        np.rint(lon * KEY_COORD_SCALE).astype(np.int64).tolist(),
+        repeat(batch_id),
+        row_hashes(df).tolist(),
+    ))
+
+
+def upsert_wisata_frames(frames, db_path=DB_FILE, batch_id=None, progress=None):
+    """Upsert a stream of typed DataFrame chunks in one transaction.
+
+    Setiap chunk diubah menjadi parameter secara vektor lalu dikirim dengan
+    ``executemany``; hanya satu chunk yang berada di memori pada satu waktu.
+    Jika terjadi error, seluruh batch di-rollback.
+
+    Args:
+        frames: Iterable DataFrame berkolom name, price, rating, rating_count,
+            latitude, longitude (sudah valid, lihat ``core.ingest``).
+        progress: Callback opsional ``progress(rows_written)`` setelah tiap chunk.
+
+    Returns:
+        Dict seperti :func:`upsert_wisata_rows`.
+    """
+    conn = get_connection(db_path)
+    now = datetime.utcnow().isoformat()
+    batch_id = batch_id or new_batch_id()
+    written = changed = 0
+
+    with conn:
+        cur = conn.cursor()
+        count_before = cur.execute('SELECT COUNT(*) FROM wisata').fetchone()[0]
+        for df in frames:
+            if len(df):
+                cur.executemany(UPSERT_WISATA_SQL, _frame_params(df, now, batch_id))
+                changed += cur.rowcount
+                written += len(df)
+            if progress is not None:
+                progress(written)
+        inserted = cur.execute('SELECT COUNT(*) FROM wisata').fetchone()[0] - count_before
+
+    return {
+        'inserted': inserted,
+        'updated': changed - inserted,
+        'unchanged': written - changed,
+        'batch_id': batch_id,
+    }
+
+
+def delta_sync_wisata_frames(frames, db_path=DB_FILE, batch_id=None, progress=None,
+                             delete_missing=True):
+    """Apply only the differences between incoming rows and the wisata table.
+
+    Hash isi setiap baris masuk (:func:`row_hashes`) dicocokkan dengan kolom
+    ``row_hash`` yang ber-index: hanya baris dengan hash baru yang di-upsert,
+    dan (jika ``delete_missing``) baris tersimpan yang hash-nya tidak ada
+    di data masuk dihapus. Semuanya dalam satu transaksi.
+
+    Args:
+        frames: Iterable DataFrame bertipe seperti :func:`upsert_wisata_frames`.
+        progress: Callback opsional ``progress(rows_processed)`` setelah tiap chunk.
+        delete_missing: Hapus baris yang tidak ada di data masuk.
+
+    Returns:
+        Dict ``inserted``, ``updated``, ``deleted``, ``unchanged`` dan ``batch_id``.
+    """
+    conn = get_connection(db_path)
+    now = datetime.utcnow().isoformat()
+    batch_id = batch_id or new_batch_id()
+    processed = changed = deleted = 0
+
+    cur = conn.cursor()
+    cur.execute('BEGIN IMMEDIATE')
+    try:
+        # Tabel temp dibuat di dalam transaksi sehingga ikut hilang saat rollback
+        cur.execute('CREATE TEMP TABLE delta_seen (row_hash INTEGER PRIMARY KEY) WITHOUT ROWID')
+        cur.execute('CREATE TEMP TABLE delta_chunk (row_hash INTEGER PRIMARY KEY) WITHOUT ROWID')
+        count_before = cur.execute('SELECT COUNT(*) FROM wisata').fetchone()[0]
+
+        for df in frames:
+            if len(df):
+                hashes = row_hashes(df)
+                cur.execute('DELETE FROM temp.delta_chunk')
+                cur.executemany(
+                    'INSERT OR IGNORE INTO temp.delta_chunk (row_hash) VALUES (?)',
+                    ((h,) for h in hashes.tolist())
+                )
+                # Hash yang belum ada di tabel = baris baru atau berubah
+                new_hashes = [row[0] for row in cur.execute('''
+                    SELECT c.row_hash FROM temp.delta_chunk c
+                    WHERE NOT EXISTS (SELECT 1 FROM wisata w WHERE w.row_hash = c.row_hash)
+                ''')]
+                cur.execute(
+                    'INSERT OR IGNORE INTO temp.delta_seen SELECT row_hash FROM temp.delta_chunk'
+                )
+
+                if new_hashes:
+                    subset = df[np.isin(hashes, new_hashes)]
+                    cur.executemany(UPSERT_WISATA_SQL, _frame_params(subset, now, batch_id))
+                    changed += cur.rowcount
+                processed += len(df)
+            if progress is not None:
+                progress(processed)
+
+        inserted = cur.execute('SELECT COUNT(*) FROM wisata').fetchone()[0] - count_before
+        if delete_missing:
+            if not processed:
+                raise ValueError(
+                    'Tidak ada baris valid; import delta dibatalkan agar tabel tidak terhapus'
+                )
+            deleted = cur.execute('''
+                DELETE FROM wisata WHERE NOT EXISTS (
+                    SELECT 1 FROM temp.delta_seen s WHERE s.row_hash = wisata.row_hash
+                )
+            ''').rowcount
+        cur.execute('DROP TABLE temp.delta_seen')
+        cur.execute('DROP TABLE temp.delta_chunk')
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    return {
+        'inserted': inserted,
+        'updated': changed - inserted,
+        'deleted': deleted,
+        'unchanged': processed - changed,
+        'batch_id': batch_id,
+    }
+
+
+def save_wisata_rows(rows, db_path=DB_FILE):
+    """Save wisata rows to database (deduplicated, see upsert_wisata_rows)."""
+    return upsert_wisata_rows(rows, db_path)
 
 
 def load_wisata_db(db_path=DB_FILE):
     """Load all wisata from database."""
-    conn = sqlite3.connect(db_path)
-    df = pd.read_sql_query('SELECT * FROM wisata', conn)
-    conn.close()
-    return df
+    conn = get_connection(db_path)
+    return pd.read_sql_query('SELECT * FROM wisata', conn)
+
+
+def _check_columns(columns):
+    columns = list(WISATA_DTYPES) if columns is None else list(columns)
+    unknown = [c for c in columns if c not in WISATA_DTYPES]
+    if unknown:
+        raise ValueError(f'Kolom wisata tidak dikenal: {", ".join(unknown)}')
+    return columns
+
+
+def load_wisata_columns(columns=None, db_path=DB_FILE, batch_size=FETCH_BATCH):
+    """Load selected wisata columns into preallocated NumPy arrays.
+
+    Args:
+        columns: Nama kolom yang dimuat; ``None`` untuk semua kolom.
+        db_path: Path file database.
+        batch_size: Jumlah baris per ``fetchmany``.
+
+    Returns:
+        :class:`core.catalog.Catalog` berisi satu array per kolom.
+    """
+    columns = _check_columns(columns)
+
+    conn = get_connection(db_path)
+    own_txn = not conn.in_transaction
+    if own_txn:
+        # Snapshot baca agar COUNT dan SELECT melihat data yang sama
+        conn.execute('BEGIN')
+    try:
+        version = _wisata_version(conn)
+        n = conn.execute('SELECT COUNT(*) FROM wisata').fetchone()[0]
+        arrays = {c: np.empty(n, dtype=WISATA_DTYPES[c]) for c in columns}
+
+        cur = conn.execute(f'SELECT {", ".join(columns)} FROM wisata ORDER BY id')
+        pos = 0
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            end = pos + len(rows)
+            # Skema STRICT menjamin tipe kolom, tidak perlu konversi
+            for c, values in zip(columns, zip(*rows)):
+                arrays[c][pos:end] = values
+            pos = end
+    finally:
+        if own_txn:
+            conn.commit()
+
+    return Catalog(arrays, version=version)
+
+
+def fetch_wisata_page(after_id=0, limit=PAGE_SIZE, columns=None, where=None,
+                      params=(), db_path=DB_FILE):
+    """Fetch one page of wisata rows ordered by id, starting after ``after_id``.
+
+    Menggunakan keyset pagination (``WHERE id > ?``) sehingga halaman yang
+    dalam tetap O(limit), tidak bergantung pada offset.
+
+    Args:
+        after_id: Id terakhir dari halaman sebelumnya (0 untuk awal tabel).
+        limit: Jumlah baris maksimum per halaman.
+        columns: Proyeksi kolom; ``None`` untuk semua kolom.
+        where: Kondisi SQL tambahan, misal ``'rating >= ?'``.
+        params: Parameter untuk placeholder di ``where``.
+        db_path: Path file database.
+
+    Returns:
+        Tuple ``(df, last_id)``; ``last_id`` bernilai None jika tidak ada baris.
+    """
+    columns = _check_columns(columns)
+    select_cols = columns if 'id' in columns else ['id'] + columns
+
+    sql = f'SELECT {", ".join(select_cols)} FROM wisata WHERE id > ?'
+    if where:
+        sql += f' AND ({where})'
+    sql += ' ORDER BY id LIMIT ?'
+
+    conn = get_connection(db_path)
+    rows = conn.execute(sql, (after_id, *params, limit)).fetchall()
+    if not rows:
+        return pd.DataFrame(columns=columns), None
+
+    last_id = rows[-1][select_cols.index('id')]
+    df = pd.DataFrame.from_records(rows, columns=select_cols)
+    return df[columns], last_id
+
+
+def iter_wisata_batches(batch_size=PAGE_SIZE, columns=None, where=None, params=(),
+                        db_path=DB_FILE):
+    """Yield the wisata table as DataFrames of at most ``batch_size`` rows."""
+    last_id = 0
+    while True:
+        df, last_id = fetch_wisata_page(
+            last_id, batch_size, columns, where, params, db_path
+        )
+        if last_id is None:
+            return
+        yield df
+        if len(df) < batch_size:
+            return
+
+
+def export_wisata_csv(path, columns=None, where=None, params=(),
+                      batch_size=PAGE_SIZE, db_path=DB_FILE):
+    """Stream the wisata table to a CSV file batch by batch.
+
+    Returns:
+        Jumlah baris yang ditulis.
+    """
+    columns = _check_columns(columns)
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for df in iter_wisata_batches(batch_size, columns, where, params, db_path):
+            df.to_csv(f, index=False, header=(written == 0))
+            written += len(df)
+        if written == 0:
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+    return written
+
+
+def count_wisata(where=None, params=(), db_path=DB_FILE):
+    """Count wisata rows, optionally restricted by a WHERE clause."""
+    sql = 'SELECT COUNT(*) FROM wisata'
+    if where:
+        sql += f' WHERE {where}'
+    return get_connection(db_path).execute(sql, tuple(params)).fetchone()[0]
+
+
+def _wisata_version(conn):
+    row = conn.execute('''
+        SELECT
+            (SELECT value FROM catalog_meta WHERE key = 'dataset_id'),
+            (SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'wisata'),
+            (SELECT value FROM catalog_meta WHERE key = 'wisata_changes')
+    ''').fetchone()
+    return '{}:{}:{}'.format(*row)
+
+
+def wisata_version(db_path=DB_FILE):
+    """Return the persistent version string of the wisata table.
+
+    Versi berubah setiap ada insert (``sqlite_sequence``), update atau
+    delete (trigger) pada tabel wisata, dan tetap sama setelah restart.
+    """
+    return _wisata_version(get_connection(db_path))
+
+
+def dataset_version(db_path=DB_FILE):
+    """Return a cheap token that changes whenever the database is modified.
+
+    Token dibaca dari ``PRAGMA data_version`` pada koneksi probe yang tidak
+    pernah menulis, sehingga setiap commit dari koneksi lain (thread lain
+    maupun proses lain) mengubah nilainya.
+    """
+    key = _db_key(db_path)
+    epoch = _db_epoch(key)
+
+    with _probe_lock:
+        entry = _probes.get(key)
+        if entry is None or entry[1] != epoch:
+            if entry is not None:
+                entry[0].close()
+            conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            entry = _probes[key] = (conn, epoch)
+        version = entry[0].execute('PRAGMA data_version').fetchone()[0]
+
+    return epoch, version
+
+
+def get_catalog(columns=None, db_path=DB_FILE):
+    """Return wisata columns from the process-wide cache.
+
+    Tabel hanya dibaca ulang jika :func:`dataset_version` berubah dan
+    :func:`wisata_version` menunjukkan tabel wisata ikut berubah (commit
+    ke tabel lain, misalnya cache ranking, tidak memicu pembacaan ulang).
+    Saat cache masih kosong, snapshot kolom (lihat :mod:`core.snapshot`)
+    di-memory-map jika versinya sama dengan database. Array yang
+    dikembalikan bersifat read-only karena dipakai bersama oleh semua
+    pemanggil.
+    """
+    columns = _check_columns(columns)
+    if db_path == ':memory:':
+        return load_wisata_columns(columns, db_path)
+
+    key = _db_key(db_path)
+    version = dataset_version(db_path)
+
+    with _catalog_lock:
+        entry = _catalog_cache.get(key)
+
+    cached = None
+    if entry is not None:
+        if entry[0] == version:
+            cached = entry[1]
+        elif entry[1].version == wisata_version(db_path):
+            cached = entry[1]
+            with _catalog_lock:
+                _catalog_cache[key] = (version, cached)
+
+    if cached is not None and all(c in cached for c in columns):
+        return cached.select(columns)
+
+    if cached is None:
+        snapshot = load_snapshot(snapshot_dir_for(db_path), wisata_version(db_path), columns)
+        if snapshot is not None:
+            with _catalog_lock:
+                _catalog_cache[key] = (version, snapshot)
+            return snapshot.select(columns)
+
+    # Muat kolom yang diminta ditambah kolom yang sudah ada di cache
+    load_cols = columns + ([c for c in cached.names if c not in columns] if cached else [])
+    catalog = load_wisata_columns(load_cols, db_path)
+    for arr in catalog.columns.values():
+        arr.flags.writeable = False
+
+    with _catalog_lock:
+        _catalog_cache[key] = (version, catalog)
+
+    return catalog.select(columns)
 
 
-def reset_wisata_table(db_path=DB_FILE):
-    """Reset wisata table (delete all data)."""
-    conn = sqlite3.connect(db_path)
+def save_snapshot(db_path=DB_FILE, cached_only=False):
+    """Write a fresh column snapshot if the stored one is stale.
+
+    Args:
+        cached_only: Hanya tulis dari catalog yang sudah ada di cache proses
+            dan masih sesuai versi tabel; tabel tidak pernah dibaca ulang
+            (dipakai saat aplikasi ditutup).
+
+    Returns:
+        True jika snapshot ditulis ulang, False jika sudah terbaru atau
+        (dengan ``cached_only``) tidak ada catalog terkini di cache.
+    """
+    snapshot_dir = snapshot_dir_for(db_path)
+    version = wisata_version(db_path)
+    manifest = read_manifest(snapshot_dir)
+    if manifest is not None and manifest.get('version') == version:
+        return False
+
+    if cached_only:
+        with _catalog_lock:
+            entry = _catalog_cache.get(_db_key(db_path))
+        catalog = entry[1] if entry is not None else None
+        if (catalog is None or catalog.version != version
+                or not all(c in catalog for c in SNAPSHOT_COLUMNS)):
+            return False
+        catalog = catalog.select(SNAPSHOT_COLUMNS)
+    else:
+        catalog = get_catalog(SNAPSHOT_COLUMNS, db_path)
+
+    export_snapshot(catalog, snapshot_dir)
+    return True
+
+
+def invalidate_catalog_cache(db_path=None):
+    """Drop cached catalogs (all databases when ``db_path`` is None)."""
+    with _catalog_lock:
+        if db_path is None:
+            _catalog_cache.clear()
+        else:
+            _catalog_cache.pop(_db_key(db_path), None)
+
+
+# Batas cache ranking; entri yang paling lama tidak dipakai dibuang dulu
+RANKING_CACHE_MAX_ENTRIES = 32
+RANKING_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _try_write(conn, write):
+    """Run ``write(conn)`` in a transaction without waiting for other writers.
+
+    Dipakai untuk tulisan yang hanya optimasi (cache ranking): jika database
+    sedang dikunci penulis lain (misal ingest), tulisan dilewati alih-alih
+    menunggu ``BUSY_TIMEOUT``.
+
+    Returns:
+        True jika tertulis, False jika dilewati.
+    """
+    conn.execute('PRAGMA busy_timeout = 0')
+    try:
+        with conn:
+            write(conn)
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.execute(f'PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}')
+
+
+def load_cached_ranking(cache_key, db_path=DB_FILE):
+    """Look up a cached ranking.
+
+    Pembaruan ``last_used`` dilewati jika database sedang dikunci penulis
+    lain, sehingga pencarian cache tidak pernah menunggu ingest.
+
+    Returns:
+        Tuple ``(scores, ranks)`` sebagai array NumPy, atau None jika tidak ada.
+    """
+    conn = get_connection(db_path)
+    row = conn.execute(
+        'SELECT row_count, scores, ranks FROM ranking_cache WHERE cache_key = ?',
+        (cache_key,)
+    ).fetchone()
+    if row is None:
+        return None
+
+    _try_write(conn, lambda c: c.execute(
+        'UPDATE ranking_cache SET last_used = ? WHERE cache_key = ?',
+        (time.time(), cache_key)
+    ))
+
+    n, scores, ranks = row
+    return (
+        np.frombuffer(scores, dtype=np.float64, count=n),
+        np.frombuffer(ranks, dtype=np.int32, count=n),
+    )
+
+
+def save_cached_ranking(cache_key, scores, ranks, db_path=DB_FILE):
+    """Store a ranking result and evict least recently used entries.
+
+    Best-effort: dilewati jika database sedang dikunci penulis lain.
+
+    Returns:
+        True jika hasil tersimpan.
+    """
+    scores = np.ascontiguousarray(scores, dtype=np.float64)
+    ranks = np.ascontiguousarray(ranks, dtype=np.int32)
+    size = scores.nbytes + ranks.nbytes
+
+    def write(conn):
+        conn.execute('''
+            INSERT OR REPLACE INTO ranking_cache
+                (cache_key, row_count, scores, ranks, size_bytes, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (cache_key, len(scores), scores.tobytes(), ranks.tobytes(), size, time.time()))
+
+        conn.execute('''
+            DELETE FROM ranking_cache WHERE cache_key IN (
+                SELECT cache_key FROM ranking_cache
+                ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        ''', (RANKING_CACHE_MAX_ENTRIES,))
+        conn.execute('''
+            DELETE FROM ranking_cache WHERE cache_key IN (
+                SELECT cache_key FROM (
+                    SELECT cache_key,
+                           SUM(size_bytes) OVER (ORDER BY last_used DESC) AS total
+                    FROM ranking_cache
+                ) WHERE total > ?
+            )
+        ''', (RANKING_CACHE_MAX_BYTES,))
+
+    return _try_write(get_connection(db_path), write)
+
+
+def _vacuum(conn, full=True):
+    """Return free pages to the OS after large deletes.
+
+    ``VACUUM`` penuh sekaligus mengaktifkan auto_vacuum incremental pada
+    database lama; jika database sedang dibaca koneksi lain, cukup jalankan
+    incremental vacuum.
+    """
+    if full:
+        try:
+            conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            conn.execute('VACUUM')
+            # Dalam mode WAL file utama baru mengecil setelah checkpoint
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            return
+        except sqlite3.OperationalError:
+            pass
+    # execute() hanya menjalankan satu langkah pragma (satu halaman);
+    # executescript menjalankannya sampai seluruh freelist dibebaskan
+    conn.executescript('PRAGMA incremental_vacuum;')
+
+
+def reset_wisata_table(db_path=DB_FILE, vacuum=True):
+    """Reset wisata table (delete all data).
+
+    Tabel di-drop dan dibuat ulang dalam satu transaksi (tanpa menjalankan
+    trigger per baris seperti ``DELETE FROM``), lalu file dipadatkan.
+    """
+    conn = get_connection(db_path)
     cur = conn.cursor()
-    cur.execute('DELETE FROM wisata')
-    conn.commit()
-    conn.close()
+    cur.execute('BEGIN IMMEDIATE')
+    try:
+        cur.execute('DROP TABLE wisata')
+        _create_wisata_table(cur)
+        _create_wisata_indexes(cur)
+        _create_wisata_triggers(cur)
+        _bump_wisata_changes(cur)
+        cur.execute('DELETE FROM ranking_cache')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    if vacuum:
+        _vacuum(conn)
+
+
+def _delete_wisata_where(where, params, db_path, vacuum):
+    conn = get_connection(db_path)
+    with conn:
+        deleted = conn.execute(f'DELETE FROM wisata WHERE {where}', params).rowcount
+    if vacuum and deleted:
+        _vacuum(conn, full=False)
+    return deleted
+
+
+def delete_wisata_in_bbox(min_lat, max_lat, min_lon, max_lon, db_path=DB_FILE, vacuum=True):
+    """Hapus wisata di dalam kotak koordinat (memakai index latitude/longitude).
+
+    Returns:
+        Jumlah baris yang dihapus.
+    """
+    return _delete_wisata_where(
+        'latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?',
+        (min_lat, max_lat, min_lon, max_lon), db_path, vacuum
+    )
+
+
+def delete_wisata_created_between(start=None, end=None, db_path=DB_FILE, vacuum=True):
+    """Hapus wisata berdasarkan ``created_at`` (ISO 8601, batas ``end`` eksklusif).
+
+    Returns:
+        Jumlah baris yang dihapus.
+    """
+    clauses, params = [], []
+    if start is not None:
+        clauses.append('created_at >= ?')
+        params.append(start.isoformat() if isinstance(start, datetime) else start)
+    if end is not None:
+        clauses.append('created_at < ?')
+        params.append(end.isoformat() if isinstance(end, datetime) else end)
+    if not clauses:
+        raise ValueError('Minimal salah satu dari start atau end harus diisi')
+    return _delete_wisata_where(' AND '.join(clauses), tuple(params), db_path, vacuum)
+
+
+def delete_wisata_batch(batch_id, db_path=DB_FILE, vacuum=True):
+    """Hapus semua wisata dari satu batch ingest.
+
+    Returns:
+        Jumlah baris yang dihapus.
+    """
+    return _delete_wisata_where('batch_id = ?', (batch_id,), db_path, vacuum)
 
 
 def delete_database_file(db_path=DB_FILE):
@@ -92,46 +1094,151 @@ def delete_database_file(db_path=DB_FILE):
     This is a destructive operation; caller may want to call `init_db()` afterwards
     to recreate an empty database file.
     """
+    key = _db_key(db_path)
+    close_connections(db_path)
+    invalidate_catalog_cache(db_path)
+    # Koneksi thread lain akan dibuka ulang saat dipakai berikutnya
+    with _epoch_lock:
+        _db_epochs[key] = _db_epochs.get(key, 0) + 1
+
     try:
         if os.path.exists(db_path):
             os.remove(db_path)
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
             return True
         return False
     except Exception:
         return False
 
 
-def save_user_location(lat, lon, db_path=DB_FILE):
-    """Save user location."""
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
+# Satu statement: kolom yang bernilai NULL tidak menimpa nilai tersimpan
+UPSERT_PROFILE_SQL = '''
+    INSERT INTO user_profile (
+        profile_id, latitude, longitude, weights, criteria_plan, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (profile_id) DO UPDATE SET
+        latitude = COALESCE(excluded.latitude, latitude),
+        longitude = COALESCE(excluded.longitude, longitude),
+        weights = COALESCE(excluded.weights, weights),
+        criteria_plan = COALESCE(excluded.criteria_plan, criteria_plan),
+        updated_at = excluded.updated_at
+'''
+
+
+def save_user_profile(profile_id, lat=None, lon=None, weights=None, criteria_plan=None,
+                      db_path=DB_FILE):
+    """Upsert profil user dalam satu statement.
+
+    Args:
+        profile_id: Id user atau sesi.
+        lat, lon: Lokasi user; None berarti tidak diubah.
+        weights: Vektor bobot kriteria (disimpan sebagai JSON); None = tidak diubah.
+        criteria_plan: Rencana kriteria, misal ``core.ranking.criteria_plan()``.
+    """
+    if (lat is None) != (lon is None):
+        raise ValueError('Latitude dan longitude harus diisi bersamaan')
+    params = (
+        profile_id,
+        None if lat is None else float(lat),
+        None if lon is None else float(lon),
+        None if weights is None else json.dumps([float(w) for w in weights]),
+        criteria_plan,
+        datetime.utcnow().isoformat(),
+    )
+    conn = get_connection(db_path)
+    with conn:
+        conn.execute(UPSERT_PROFILE_SQL, params)
+
+
+def save_user_profiles(profiles, db_path=DB_FILE):
+    """Upsert banyak profil sekaligus dalam satu transaksi.
+
+    Args:
+        profiles: Iterable dict dengan key ``profile_id`` dan opsional
+            ``lat``, ``lon``, ``weights``, ``criteria_plan``.
+    """
     now = datetime.utcnow().isoformat()
-    
-    try:
-        cur.execute('DELETE FROM user_location')
-        cur.execute(
-            'INSERT INTO user_location (latitude, longitude, updated_at) VALUES (?, ?, ?)',
-            (lat, lon, now)
-        )
-        conn.commit()
-        
-        # Verify the save
-        cur.execute('SELECT COUNT(*) FROM user_location')
-        count = cur.fetchone()[0]
-        
-        return count > 0
-    finally:
-        conn.close()
+    params = []
+    for p in profiles:
+        weights = p.get('weights')
+        params.append((
+            p['profile_id'], p.get('lat'), p.get('lon'),
+            None if weights is None else json.dumps([float(w) for w in weights]),
+            p.get('criteria_plan'), now,
+        ))
+    conn = get_connection(db_path)
+    with conn:
+        conn.executemany(UPSERT_PROFILE_SQL, params)
+    return len(params)
 
 
-def load_user_location(db_path=DB_FILE):
-    """Load latest user location."""
-    conn = sqlite3.connect(db_path)
-    cur = conn.cursor()
-    cur.execute('SELECT latitude, longitude, updated_at FROM user_location ORDER BY id DESC LIMIT 1')
-    row = cur.fetchone()
-    conn.close()
-    
-    if row:
+def _profile_dict(row):
+    return {
+        'profile_id': row[0],
+        'lat': row[1],
+        'lon': row[2],
+        'weights': None if row[3] is None else json.loads(row[3]),
+        'criteria_plan': row[4],
+        'updated_at': row[5],
+    }
+
+
+def load_user_profile(profile_id, db_path=DB_FILE):
+    """Return profil user sebagai dict, atau None jika belum ada."""
+    row = get_connection(db_path).execute(
+        'SELECT profile_id, latitude, longitude, weights, criteria_plan, updated_at '
+        'FROM user_profile WHERE profile_id = ?', (profile_id,)
+    ).fetchone()
+    return _profile_dict(row) if row else None
+
+
+def load_user_profiles(profile_ids=None, db_path=DB_FILE):
+    """Load beberapa profil sekaligus (semua profil jika ``profile_ids`` None).
+
+    Returns:
+        Dict ``{profile_id: profil}``.
+    """
+    sql = ('SELECT profile_id, latitude, longitude, weights, criteria_plan, updated_at '
+           'FROM user_profile')
+    conn = get_connection(db_path)
+    if profile_ids is None:
+        rows = conn.execute(sql).fetchall()
+    else:
+        ids = list(profile_ids)
+        rows = []
+        # Batas jumlah parameter SQLite lama adalah 999
+        for i in range(0, len(ids), 900):
+            part = ids[i:i + 900]
+            rows += conn.execute(
+                f'{sql} WHERE profile_id IN ({",".join("?" * len(part))})', part
+            ).fetchall()
+    return {row[0]: _profile_dict(row) for row in rows}
+
+
+def delete_user_profile(profile_id, db_path=DB_FILE):
+    """Hapus profil user. Returns True jika profil ada."""
+    conn = get_connection(db_path)
+    with conn:
+        return conn.execute(
+            'DELETE FROM user_profile WHERE profile_id = ?', (profile_id,)
+        ).rowcount > 0
+
+
+def save_user_location(lat, lon, db_path=DB_FILE, profile_id=DEFAULT_PROFILE):
+    """Save user location."""
+    save_user_profile(profile_id, lat, lon, db_path=db_path)
+    return True
+
+
+def load_user_location(db_path=DB_FILE, profile_id=DEFAULT_PROFILE):
+    """Load user location of a profile."""
+    row = get_connection(db_path).execute(
+        'SELECT latitude, longitude, updated_at FROM user_profile WHERE profile_id = ?',
+        (profile_id,)
+    ).fetchone()
+
+    if row and row[0] is not None:
         return float(row[0]), float(row[1]), row[2]
-    return None, None, None
\ No newline at end of file
+    return None, None, None
@@ -4,6 +4,8 @@ Haversine formula untuk menghitung jarak antara dua koordinat geografis.
 
 import math
 
+import numpy as np
+
 
 def haversine_km(lat1, lon1, lat2, lon2):
     """
@@ -27,3 +29,26 @@ def haversine_km(lat1, lon1, lat2, lon2):
     c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
     
     return 6371.0 * c
+
+
+def haversine_km_array(lat, lon, lats, lons):
+    """
+    Vectorized Haversine distance from one point to many coordinates.
+
+    Args:
+        lat, lon: Reference coordinate in degrees.
+        lats, lons: Arrays of coordinates in degrees.
+
+    Returns:
+        Array of distances in kilometers.
+    """
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    lon2 = np.radians(np.asarray(lons, dtype=float))
+
+    a = (np.sin((lat2 - lat1) / 2)**2 +
+         math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2)
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return 6371.0 * c
@@ -0,0 +1,434 @@
+"""
+Ingest data wisata dari file besar langsung ke SQLite secara bertahap.
+
+File dibaca per chunk, setiap chunk divalidasi dan dikonversi tipenya secara
+vektor, lalu langsung di-upsert; memori yang dipakai tidak bergantung pada
+ukuran file.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from core.database import DB_FILE, delta_sync_wisata_frames, upsert_wisata_frames
+from core.validation import WISATA_COLUMNS, RejectReport, valid_rows
+
+
+INGEST_COLUMNS = WISATA_COLUMNS
+
+# Jumlah baris per chunk saat membaca file
+CSV_CHUNK_SIZE = 50000
+
+CSV_EXTENSIONS = ('.csv',)
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+INGEST_EXTENSIONS = (
+    CSV_EXTENSIONS + EXCEL_EXTENSIONS + PARQUET_EXTENSIONS + ARROW_EXTENSIONS
+    + JSONL_EXTENSIONS
+)
+
+
+class IngestCancelled(Exception):
+    """Ingest dibatalkan user; transaksi sudah di-rollback."""
+
+
+def clean_chunk(df, row_offset=0):
+    """Validasi satu chunk (lihat :mod:`core.validation`).
+
+    Returns:
+        Tuple ``(clean_df, report)``; ``report`` berisi nomor baris yang
+        ditolak beserta alasannya.
+    """
+    return valid_rows(df[INGEST_COLUMNS], row_offset)
+
+
+def check_columns(df):
+    """Raise ValueError jika DataFrame tidak memiliki semua kolom wajib."""
+    missing = [c for c in INGEST_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f'Kolom wajib yang hilang: {", ".join(missing)}')
+
+
+def check_csv_columns(path):
+    """Raise ValueError jika header CSV tidak memiliki semua kolom wajib."""
+    check_columns(pd.read_csv(path, nrows=0))
+
+
+def read_csv_chunks(path, chunk_size=CSV_CHUNK_SIZE):
+    """Iterate over raw CSV chunks containing only the required columns."""
+    check_csv_columns(path)
+    return pd.read_csv(
+        path, usecols=INGEST_COLUMNS, dtype={'name': str}, chunksize=chunk_size
+    )
+
+
+def split_frame(df, chunk_size=CSV_CHUNK_SIZE):
+    """Potong DataFrame yang sudah ada di memori menjadi chunk."""
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def _iter_xlsx_chunks(workbook, rows, indexes, chunk_size):
+    try:
+        buffer = []
+        for row in rows:
+            buffer.append([row[i] if i < len(row) else None for i in indexes])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=INGEST_COLUMNS)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=INGEST_COLUMNS)
+    finally:
+        workbook.close()
+
+
+def read_xlsx_chunks(path, chunk_size=CSV_CHUNK_SIZE):
+    """Stream chunks from the first sheet of an ``.xlsx`` workbook.
+
+    Workbook dibuka dengan ``read_only=True`` dan baris dibaca sebagai nilai
+    (``values_only``), sehingga model objek workbook tidak pernah dibangun
+    dan hanya kolom wajib yang disimpan per chunk.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [None if h is None else str(h).strip() for h in next(rows, ())]
+        check_columns(pd.DataFrame(columns=header))
+        indexes = [header.index(c) for c in INGEST_COLUMNS]
+    except Exception:
+        workbook.close()
+        raise
+    return _iter_xlsx_chunks(workbook, rows, indexes, chunk_size)
+
+
+def read_excel_chunks(path, chunk_size=CSV_CHUNK_SIZE):
+    """Iterate over chunks of the first sheet of an Excel file.
+
+    ``.xlsx`` dibaca secara streaming (:func:`read_xlsx_chunks`); format
+    ``.xls`` lama tidak didukung openpyxl sehingga dibaca penuh oleh pandas.
+    """
+    if path.lower().endswith('.xlsx'):
+        return read_xlsx_chunks(path, chunk_size)
+    df = pd.read_excel(path)
+    check_columns(df)
+    return split_frame(df[INGEST_COLUMNS], chunk_size)
+
+
+def _import_pyarrow():
+    """Import pyarrow (opsional) hanya saat file Parquet/Arrow dibaca."""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            'Format Parquet/Arrow membutuhkan pyarrow: pip install pyarrow'
+        ) from e
+    return pyarrow
+
+
+def _check_schema(schema):
+    check_columns(pd.DataFrame(columns=list(schema.names)))
+
+
+def read_parquet_chunks(path, chunk_size=CSV_CHUNK_SIZE):
+    """Stream record batches of the required columns from a Parquet file.
+
+    Hanya kolom wajib yang didekode (proyeksi kolom Parquet) dan setiap
+    batch dikonversi langsung dari buffer Arrow ke DataFrame.
+    """
+    _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    try:
+        _check_schema(parquet.schema_arrow)
+    except Exception:
+        parquet.close()
+        raise
+
+    def chunks():
+        try:
+            for batch in parquet.iter_batches(batch_size=chunk_size, columns=INGEST_COLUMNS):
+                yield batch.to_pandas()
+        finally:
+            parquet.close()
+    return chunks()
+
+
+def read_arrow_chunks(path, chunk_size=CSV_CHUNK_SIZE):
+    """Stream chunks from an Arrow IPC file or stream (termasuk Feather v2).
+
+    File di-memory-map sehingga record batch dibaca tanpa salinan dan
+    tanpa parsing; batch dipotong ulang menjadi ``chunk_size`` baris.
+    """
+    pa = _import_pyarrow()
+
+    source = pa.memory_map(path)
+    try:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            # Bukan format file IPC; coba format stream (.arrows)
+            source.seek(0)
+            reader = pa.ipc.open_stream(source)
+            batches = iter(reader)
+        _check_schema(reader.schema)
+    except Exception:
+        source.close()
+        raise
+
+    def chunks():
+        try:
+            for batch in batches:
+                batch = batch.select(INGEST_COLUMNS)
+                for start in range(0, batch.num_rows, chunk_size):
+                    yield batch.slice(start, chunk_size).to_pandas()
+        finally:
+            source.close()
+    return chunks()
+
+
+def read_jsonl_chunks(path, chunk_size=CSV_CHUNK_SIZE):
+    """Iterate over chunks of a JSON Lines file (satu objek JSON per baris).
+
+    File dibaca baris per baris oleh pandas; key yang tidak ada pada
+    sebagian baris menjadi nilai kosong dan ditolak saat validasi.
+    """
+    reader = pd.read_json(path, lines=True, chunksize=chunk_size, dtype={'name': str})
+
+    def chunks():
+        with reader:
+            for i, chunk in enumerate(reader):
+                if i == 0:
+                    check_columns(chunk)
+                yield chunk.reindex(columns=INGEST_COLUMNS)
+    return chunks()
+
+
+def read_file_chunks(path, chunk_size=CSV_CHUNK_SIZE):
+    """Pilih pembaca chunk berdasarkan ekstensi file."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in CSV_EXTENSIONS:
+        return read_csv_chunks(path, chunk_size)
+    if ext in EXCEL_EXTENSIONS:
+        return read_excel_chunks(path, chunk_size)
+    if ext in PARQUET_EXTENSIONS:
+        return read_parquet_chunks(path, chunk_size)
+    if ext in ARROW_EXTENSIONS:
+        return read_arrow_chunks(path, chunk_size)
+    if ext in JSONL_EXTENSIONS:
+        return read_jsonl_chunks(path, chunk_size)
+    raise ValueError(f'Format file tidak didukung: {ext or path}')
+
+
+def _writer(delta):
+    return delta_sync_wisata_frames if delta else upsert_wisata_frames
+
+
+def ingest_chunks(chunks, db_path=DB_FILE, progress=None, batch_id=None, cancelled=None,
+                  delta=False):
+    """Validasi dan upsert chunk mentah dalam satu transaksi.
+
+    Args:
+        chunks: Iterable DataFrame mentah (kolom seperti file sumber).
+        progress: Callback opsional ``progress(rows_read, rows_written, rejected)``
+            yang dipanggil setelah setiap chunk disimpan.
+        cancelled: Callable opsional; jika mengembalikan True di antara
+            chunk, ingest berhenti dengan :class:`IngestCancelled` dan
+            tidak ada baris yang tersimpan.
+        delta: Import delta (``database.delta_sync_wisata_frames``): hanya
+            baris yang berubah yang ditulis dan baris yang tidak ada di data
+            masuk dihapus; statistik juga berisi ``deleted``.
+
+    Returns:
+        Dict statistik upsert ditambah ``rows_read``, ``rejected`` dan
+        ``reject_report`` (:class:`core.validation.RejectReport`).
+    """
+    counts = {'rows_read': 0}
+    report = RejectReport()
+
+    def frames():
+        for chunk in chunks:
+            if cancelled is not None and cancelled():
+                raise IngestCancelled()
+            clean, chunk_report = clean_chunk(chunk, counts['rows_read'])
+            counts['rows_read'] += len(chunk)
+            report.extend(chunk_report)
+            yield clean
+
+    def progress_report(written):
+        if cancelled is not None and cancelled():
+            raise IngestCancelled()
+        if progress is not None:
+            progress(counts['rows_read'], written, len(report))
+
+    stats = _writer(delta)(frames(), db_path, batch_id=batch_id, progress=progress_report)
+    stats.update(counts, rejected=len(report), reject_report=report)
+    return stats
+
+
+def ingest_csv(path, db_path=DB_FILE, chunk_size=CSV_CHUNK_SIZE, progress=None,
+               batch_id=None):
+    """Stream a CSV file into the wisata table.
+
+    Returns:
+        Dict ``inserted``, ``updated``, ``unchanged``, ``batch_id``,
+        ``rows_read``, ``rejected`` dan ``reject_report``.
+    """
+    return ingest_chunks(
+        read_csv_chunks(path, chunk_size), db_path, progress=progress, batch_id=batch_id
+    )
+
+
+def ingest_file(path, db_path=DB_FILE, chunk_size=CSV_CHUNK_SIZE, progress=None,
+                batch_id=None, cancelled=None, delta=False):
+    """Ingest file data (format dari ekstensi), lihat :func:`ingest_chunks`."""
+    return ingest_chunks(
+        read_file_chunks(path, chunk_size), db_path, progress=progress,
+        batch_id=batch_id, cancelled=cancelled, delta=delta
+    )
+
+
+def ingest_frame(df, db_path=DB_FILE, chunk_size=CSV_CHUNK_SIZE, progress=None,
+                 batch_id=None, cancelled=None, delta=False):
+    """Ingest DataFrame yang sudah dimuat (misal hasil upload) per chunk."""
+    check_columns(df)
+    return ingest_chunks(
+        split_frame(df, chunk_size), db_path, progress=progress,
+        batch_id=batch_id, cancelled=cancelled, delta=delta
+    )
+
+
+def list_ingest_files(directory):
+    """File data (:data:`INGEST_EXTENSIONS`) di ``directory`` (tidak rekursif), urut nama."""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(INGEST_EXTENSIONS) and not name.startswith('~$')
+        and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def parse_file(path, chunk_size=CSV_CHUNK_SIZE):
+    """Baca dan validasi satu file menjadi batch kolom bertipe.
+
+    Dijalankan di proses worker oleh :func:`ingest_directory`; hasilnya
+    hanya berisi array NumPy per kolom agar murah dikirim antar proses.
+
+    Returns:
+        Dict ``batches`` (list dict kolom -> array), ``rows_read`` dan
+        ``reject_report``.
+    """
+    batches = []
+    rows_read = 0
+    report = RejectReport()
+    for chunk in read_file_chunks(path, chunk_size):
+        clean, chunk_report = clean_chunk(chunk, rows_read)
+        rows_read += len(chunk)
+        report.extend(chunk_report)
+        if len(clean):
+            batches.append({col: clean[col].to_numpy() for col in INGEST_COLUMNS})
+    return {'batches': batches, 'rows_read': rows_read, 'reject_report': report}
+
+
+def ingest_directory(directory, db_path=DB_FILE, chunk_size=CSV_CHUNK_SIZE,
+                     max_workers=None, progress=None, batch_id=None, cancelled=None,
+                     delta=False):
+    """Ingest semua file data dalam satu folder secara paralel.
+
+    File di-parse dan divalidasi oleh proses worker (konteks ``spawn``, aman
+    dipakai dari aplikasi Qt), sedangkan satu penulis di proses ini
+    meng-upsert hasilnya sesuai urutan nama file dalam satu transaksi.
+    Paling banyak ``2 * max_workers`` hasil file ditahan di memori.
+
+    Args:
+        progress: Callback opsional ``progress(rows_read, rows_written, rejected)``.
+        cancelled, delta: Lihat :func:`ingest_chunks`; pada mode delta seluruh
+            isi folder dianggap sebagai catalog lengkap.
+
+    Returns:
+        Dict statistik upsert ditambah ``rows_read``, ``rejected`` dan
+        ``files`` (per file: ``path``, ``rows_read``, ``rejected``,
+        ``reject_report`` atau ``error`` jika file gagal dibaca).
+    """
+    paths = list_ingest_files(directory)
+    if not paths:
+        raise ValueError(f'Tidak ada file data yang didukung di folder: {directory}')
+
+    max_workers = max_workers or min(len(paths), os.cpu_count() or 1)
+    counts = {'rows_read': 0, 'rejected': 0}
+    files = []
+
+    def frames(pool):
+        pending = deque()
+        remaining = iter(paths)
+
+        def fill():
+            while len(pending) < 2 * max_workers:
+                path = next(remaining, None)
+                if path is None:
+                    return
+                pending.append((path, pool.submit(parse_file, path, chunk_size)))
+
+        fill()
+        try:
+            while pending:
+                if cancelled is not None and cancelled():
+                    raise IngestCancelled()
+                path, future = pending.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if delta:
+                        # Baris file ini tidak pernah terlihat oleh delta sync sehingga
+                        # akan ikut terhapus; batalkan (rollback) seluruh import
+                        raise ValueError(
+                            f'Gagal membaca {os.path.basename(path)}: {e}. '
+                            'Import delta dibatalkan agar data tidak terhapus.'
+                        ) from e
+                    files.append({'path': path, 'rows_read': 0, 'rejected': 0, 'error': str(e)})
+                    fill()
+                    continue
+                fill()
+
+                report = result['reject_report']
+                counts['rows_read'] += result['rows_read']
+                counts['rejected'] += len(report)
+                files.append({
+                    'path': path, 'rows_read': result['rows_read'],
+                    'rejected': len(report), 'reject_report': report,
+                })
+                for batch in result['batches']:
+                    yield pd.DataFrame(batch, columns=INGEST_COLUMNS)
+        finally:
+            # Batal/gagal: file yang belum mulai diparse tidak perlu ditunggu
+            # (shutdown(cancel_futures=True) baru ada di Python 3.9)
+            for _, future in pending:
+                future.cancel()
+
+    def progress_report(written):
+        if cancelled is not None and cancelled():
+            raise IngestCancelled()
+        if progress is not None:
+            progress(counts['rows_read'], written, counts['rejected'])
+
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+    )
+    batches = frames(pool)
+    try:
+        stats = _writer(delta)(
+            batches, db_path, batch_id=batch_id, progress=progress_report
+        )
+    finally:
+        batches.close()
+        pool.shutdown(wait=True)
+
+    stats.update(counts, files=files)
+    return stats
@@ -0,0 +1,199 @@
+"""
+Pipeline ranking wisata: jarak Haversine + TOPSIS, dengan cache hasil di SQLite.
+"""
+
+import hashlib
+import json
+import threading
+
+import numpy as np
+
+from core.ahp import normalize_weights
+from core.database import DB_FILE, load_cached_ranking, save_cached_ranking
+from core.haversine import haversine_km_array
+from core.topsis import topsis_rank
+
+
+# Kolom catalog yang dibutuhkan pipeline dan rencana kriteria TOPSIS
+CATALOG_COLUMNS = [
+    'id', 'name', 'price', 'rating', 'rating_count', 'latitude', 'longitude'
+]
+CRITERIA_COLUMNS = ['price', 'rating', 'rating_count', 'distance_km']
+CRITERIA_TYPES = ['cost', 'benefit', 'benefit', 'cost']
+
+# Lokasi user dibulatkan ke 4 desimal (~11 meter) untuk kunci cache
+LOCATION_DECIMALS = 4
+
+# PreparedRanking terakhir (satu entri: catalog + lokasi yang sedang dipakai)
+_prepared_lock = threading.Lock()
+_prepared_cache = {}
+
+
+class RankingCancelled(Exception):
+    """Ranking dibatalkan (misal digantikan permintaan yang lebih baru)."""
+
+
+class RankingResult:
+    """Hasil ranking, sejajar dengan urutan baris catalog."""
+
+    def __init__(self, distance, scores, ranks, cached=False):
+        self.distance = distance
+        self.scores = scores
+        self.ranks = ranks
+        self.cached = cached
+
+
+def rank_scores(scores):
+    """Rank scores descending with ties sharing the lowest rank ('min' method)."""
+    neg = -np.asarray(scores, dtype=float)
+    return (np.searchsorted(np.sort(neg), neg, side='left') + 1).astype(np.int32)
+
+
+def criteria_plan(criteria_types=CRITERIA_TYPES):
+    """Deskripsi rencana kriteria, misal ``'price:cost,rating:benefit,...'``."""
+    return ','.join(f'{c}:{t}' for c, t in zip(CRITERIA_COLUMNS, criteria_types))
+
+
+def ranking_cache_key(dataset_version, weights, lat, lon, criteria_types=CRITERIA_TYPES):
+    """Build the ranking cache key.
+
+    Kunci terdiri dari versi dataset, vektor bobot ternormalisasi, lokasi
+    user yang dikuantisasi dan rencana kriteria.
+    """
+    payload = json.dumps([
+        dataset_version,
+        [round(float(w), 6) for w in normalize_weights(weights)],
+        round(float(lat), LOCATION_DECIMALS),
+        round(float(lon), LOCATION_DECIMALS),
+        criteria_plan(criteria_types),
+    ])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def decision_matrix(catalog, distance):
+    """Stack the TOPSIS criteria columns into an (n, 4) matrix."""
+    return np.column_stack([
+        catalog['price'], catalog['rating'], catalog['rating_count'], distance
+    ])
+
+
+def rank_catalog(catalog, lat, lon, weights, criteria_types=CRITERIA_TYPES,
+                 use_cache=True, db_path=DB_FILE, progress=None):
+    """Hitung jarak, skor TOPSIS dan rank untuk seluruh catalog.
+
+    Jika ``use_cache`` aktif dan catalog memiliki versi, hasil dicari dulu
+    di tabel ``ranking_cache`` dan disimpan ke sana setelah dihitung.
+
+    Args:
+        progress: Callback opsional ``progress(stage)`` sebelum setiap tahap
+            (``'distance'``, ``'cache'``, ``'topsis'``, ``'save'``); boleh
+            raise :class:`RankingCancelled` untuk menghentikan proses.
+
+    Returns:
+        :class:`RankingResult`.
+    """
+    def stage(name):
+        if progress is not None:
+            progress(name)
+
+    stage('distance')
+    distance = haversine_km_array(lat, lon, catalog['latitude'], catalog['longitude'])
+
+    key = None
+    if use_cache and catalog.version is not None:
+        stage('cache')
+        key = ranking_cache_key(catalog.version, weights, lat, lon, criteria_types)
+        hit = load_cached_ranking(key, db_path)
+        if hit is not None and len(hit[0]) == len(catalog):
+            return RankingResult(distance, hit[0], hit[1], cached=True)
+
+    stage('topsis')
+    scores = topsis_rank(
+        decision_matrix(catalog, distance), normalize_weights(weights), criteria_types
+    )
+    ranks = rank_scores(scores)
+
+    if key is not None:
+        stage('save')
+        save_cached_ranking(key, scores, ranks, db_path)
+
+    return RankingResult(distance, scores, ranks)
+
+
+class PreparedRanking:
+    """TOPSIS decision matrix prepared once for re-scoring with new weights.
+
+    Bobot yang dinormalisasi selalu non-negatif, sehingga solusi ideal
+    terbobot sama dengan ``w * ideal`` dari matriks ternormalisasi ``R``.
+    Kuadrat selisih ``(R - ideal)**2`` per kriteria dihitung sekali, dan
+    jarak untuk bobot baru cukup ``D = sqrt(A @ w**2)``. Hasilnya sama
+    dengan :func:`core.topsis.topsis_rank`.
+    """
+
+    def __init__(self, catalog, lat, lon, criteria_types=CRITERIA_TYPES):
+        self.distance = haversine_km_array(lat, lon, catalog['latitude'], catalog['longitude'])
+        X = np.asarray(decision_matrix(catalog, self.distance), dtype=float)
+
+        denom = np.sqrt((X ** 2).sum(axis=0))
+        denom[denom == 0] = 1e-12
+        R = X / denom
+
+        benefit = np.array([t == 'benefit' for t in criteria_types])
+        col_max = R.max(axis=0) if len(R) else np.zeros(R.shape[1])
+        col_min = R.min(axis=0) if len(R) else np.zeros(R.shape[1])
+        best = np.where(benefit, col_max, col_min)
+        worst = np.where(benefit, col_min, col_max)
+
+        self._sq_best = (R - best) ** 2
+        self._sq_worst = (R - worst) ** 2
+
+    def __len__(self):
+        return len(self.distance)
+
+    def scores(self, weights):
+        """Skor TOPSIS seluruh catalog untuk ``weights`` (belum dinormalisasi)."""
+        w2 = normalize_weights(weights) ** 2
+        d_plus = np.sqrt(self._sq_best @ w2)
+        d_minus = np.sqrt(self._sq_worst @ w2)
+        return d_minus / (d_plus + d_minus)
+
+    def top_k(self, weights, k):
+        """Return ``(rows, scores, ranks)`` for the ``k`` best rows.
+
+        Baris dipilih dengan ``argpartition`` (tanpa mengurutkan seluruh
+        catalog), lalu hanya ``k`` baris itu yang diurutkan. Rank sama dengan
+        :func:`rank_scores` pada seluruh catalog.
+        """
+        scores = self.scores(weights)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), scores[:0], np.empty(0, dtype=np.int32)
+        rows = np.argpartition(-scores, k - 1)[:k]
+        rows = rows[np.lexsort((rows, -scores[rows]))]
+        top = scores[rows]
+        return rows, top, rank_scores(top)
+
+
+def prepare_ranking(catalog, lat, lon, criteria_types=CRITERIA_TYPES, db_path=DB_FILE):
+    """:class:`PreparedRanking` untuk catalog dan lokasi, di-cache satu entri.
+
+    Entri dipakai ulang selama versi catalog, ukuran, lokasi (dibulatkan
+    seperti kunci cache ranking) dan rencana kriteria sama.
+    """
+    key = None
+    if catalog.version is not None:
+        key = (
+            db_path, catalog.version, len(catalog),
+            round(float(lat), LOCATION_DECIMALS), round(float(lon), LOCATION_DECIMALS),
+            tuple(criteria_types),
+        )
+        with _prepared_lock:
+            entry = _prepared_cache.get('latest')
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+    prepared = PreparedRanking(catalog, lat, lon, criteria_types)
+    if key is not None:
+        with _prepared_lock:
+            _prepared_cache['latest'] = (key, prepared)
+    return prepared
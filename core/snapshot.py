@@ -0,0 +1,120 @@
+"""
+Snapshot kolom catalog wisata dalam format .npy untuk cold start instan.
+
+Setiap kolom disimpan sebagai satu file ``.npy`` yang dapat di-memory-map,
+ditambah ``manifest.json`` berisi versi dataset saat snapshot dibuat.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+from core.catalog import Catalog
+
+
+MANIFEST_FILE = 'manifest.json'
+
+# Kolom yang disimpan secara default (kolom yang dipakai pipeline ranking)
+SNAPSHOT_COLUMNS = [
+    'id', 'name', 'price', 'rating', 'rating_count', 'latitude', 'longitude'
+]
+
+
+def snapshot_dir_for(db_path):
+    """Direktori snapshot default untuk file database, misal ``wisata_data_snapshot``."""
+    return os.path.splitext(os.path.abspath(db_path))[0] + '_snapshot'
+
+
+def read_manifest(snapshot_dir):
+    """Return the snapshot manifest dict, or None if there is no valid snapshot."""
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def export_snapshot(catalog, snapshot_dir):
+    """Write ``catalog`` as one ``.npy`` file per column plus a manifest.
+
+    Kolom teks disimpan sebagai bytes UTF-8 lebar tetap (dtype ``S``) agar
+    tetap bisa di-memory-map. Nama file memuat hash versi sehingga snapshot
+    lama yang sedang di-map tidak ditimpa; manifest ditulis terakhir.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    tag = hashlib.sha1(str(catalog.version).encode('utf-8')).hexdigest()[:12]
+
+    columns = {}
+    for name in catalog.names:
+        arr = np.asarray(catalog[name])
+        if arr.dtype == object:
+            arr = np.array([str(v).encode('utf-8') for v in arr], dtype=bytes)
+        filename = f'{name}-{tag}.npy'
+        np.save(os.path.join(snapshot_dir, filename), arr, allow_pickle=False)
+        columns[name] = {'file': filename, 'dtype': arr.dtype.str}
+
+    manifest = {
+        'version': catalog.version,
+        'rows': len(catalog),
+        'columns': columns,
+        'created_at': datetime.utcnow().isoformat(),
+    }
+    tmp_path = os.path.join(snapshot_dir, MANIFEST_FILE + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(snapshot_dir, MANIFEST_FILE))
+
+    # Hapus file kolom dari snapshot lama (gagal jika masih di-map, abaikan)
+    keep = {c['file'] for c in columns.values()}
+    for filename in os.listdir(snapshot_dir):
+        if filename.endswith('.npy') and filename not in keep:
+            try:
+                os.remove(os.path.join(snapshot_dir, filename))
+            except OSError:
+                pass
+
+    return manifest
+
+
+def load_snapshot(snapshot_dir, version=None, columns=None):
+    """Memory-map a snapshot read-only.
+
+    Args:
+        snapshot_dir: Direktori snapshot.
+        version: Versi dataset yang diharapkan; snapshot dengan versi lain
+            dianggap basi.
+        columns: Kolom yang dibutuhkan; ``None`` untuk semua kolom snapshot.
+
+    Returns:
+        :class:`core.catalog.Catalog`, atau None jika snapshot tidak ada,
+        basi, atau tidak memiliki semua kolom yang diminta.
+    """
+    manifest = read_manifest(snapshot_dir)
+    if manifest is None:
+        return None
+    if version is not None and manifest.get('version') != version:
+        return None
+
+    available = manifest.get('columns', {})
+    names = list(available) if columns is None else list(columns)
+    if any(name not in available for name in names):
+        return None
+
+    try:
+        arrays = {
+            name: np.load(
+                os.path.join(snapshot_dir, available[name]['file']),
+                mmap_mode='r', allow_pickle=False
+            )
+            for name in names
+        }
+    except (OSError, ValueError):
+        return None
+
+    if any(len(arr) != manifest.get('rows') for arr in arrays.values()):
+        return None
+
+    return Catalog(arrays, version=manifest.get('version'))
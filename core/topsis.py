@@ -10,14 +10,14 @@ def topsis_rank(df, weights, criteria_types):
     Calculate TOPSIS scores and ranking.
     
     Args:
-        df: DataFrame with decision criteria columns.
+        df: DataFrame or 2D array with decision criteria columns.
         weights: Array of normalized weights.
         criteria_types: List of 'benefit' or 'cost' for each criteria.
         
     Returns:
         Array of TOPSIS scores.
     """
-    X = df.values.astype(float)
+    X = np.asarray(getattr(df, 'values', df), dtype=float)
     
     # Normalization
     denom = np.sqrt((X**2).sum(axis=0))
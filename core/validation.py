@@ -0,0 +1,120 @@
+"""
+Validasi data wisata secara vektor (per kolom, bukan per baris).
+
+Setiap baris mendapat bitmask alasan penolakan; baris dengan mask 0 valid.
+Aturannya sama dengan constraint CHECK pada tabel ``wisata``.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+WISATA_COLUMNS = [
+    'name', 'price', 'rating', 'rating_count', 'latitude', 'longitude'
+]
+NUMERIC_COLUMNS = WISATA_COLUMNS[1:]
+
+# Bit alasan penolakan
+MISSING_NAME = 1
+NOT_NUMERIC = 2
+NEGATIVE_PRICE = 4
+RATING_OUT_OF_RANGE = 8
+NEGATIVE_COUNT = 16
+LATITUDE_OUT_OF_RANGE = 32
+LONGITUDE_OUT_OF_RANGE = 64
+
+REASON_LABELS = {
+    MISSING_NAME: 'nama kosong',
+    NOT_NUMERIC: 'nilai kosong atau bukan angka',
+    NEGATIVE_PRICE: 'harga negatif',
+    RATING_OUT_OF_RANGE: 'rating di luar 0-5',
+    NEGATIVE_COUNT: 'jumlah ulasan negatif',
+    LATITUDE_OUT_OF_RANGE: 'latitude di luar -90..90',
+    LONGITUDE_OUT_OF_RANGE: 'longitude di luar -180..180',
+}
+
+
+def reason_text(mask):
+    """Teks alasan untuk satu bitmask, misal ``'harga negatif, rating di luar 0-5'``."""
+    return ', '.join(label for bit, label in REASON_LABELS.items() if mask & bit)
+
+
+class RejectReport:
+    """Daftar baris yang ditolak: nomor baris (1 = baris data pertama) + bitmask."""
+
+    def __init__(self, rows=None, reasons=None):
+        self.rows = np.asarray(rows if rows is not None else [], dtype=np.int64)
+        self.reasons = np.asarray(reasons if reasons is not None else [], dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def extend(self, other):
+        """Gabungkan laporan chunk berikutnya (nomor baris sudah absolut)."""
+        self.rows = np.concatenate([self.rows, other.rows])
+        self.reasons = np.concatenate([self.reasons, other.reasons])
+
+    def counts(self):
+        """Jumlah baris per alasan, misal ``{'harga negatif': 3}``."""
+        return {
+            label: int(np.count_nonzero(self.reasons & bit))
+            for bit, label in REASON_LABELS.items()
+            if np.any(self.reasons & bit)
+        }
+
+    def describe(self, limit=10):
+        """Ringkasan teks untuk ditampilkan ke user."""
+        lines = [f'{label}: {n} baris' for label, n in self.counts().items()]
+        for row, mask in zip(self.rows[:limit], self.reasons[:limit]):
+            lines.append(f'Baris {row}: {reason_text(mask)}')
+        if len(self) > limit:
+            lines.append(f'... dan {len(self) - limit} baris lainnya')
+        return '\n'.join(lines)
+
+
+def validate_wisata(df, row_offset=0):
+    """Validate and type wisata rows column by column.
+
+    Args:
+        df: DataFrame dengan kolom :data:`WISATA_COLUMNS` (nilai mentah).
+        row_offset: Jumlah baris data sebelum ``df`` (untuk input per chunk).
+
+    Returns:
+        Tuple ``(typed, reasons, report)``: ``typed`` berisi kolom numerik
+        float64 dan nama yang sudah di-strip (semua baris), ``reasons`` array
+        bitmask per baris (0 = valid) dan ``report`` :class:`RejectReport`.
+    """
+    typed = pd.DataFrame(index=df.index)
+    name = df['name']
+    typed['name'] = name.astype(str).str.strip()
+    missing_name = name.isna().to_numpy() | (typed['name'] == '').to_numpy()
+
+    for col in NUMERIC_COLUMNS:
+        typed[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float64)
+    values = {col: typed[col].to_numpy() for col in NUMERIC_COLUMNS}
+
+    reasons = np.zeros(len(df), dtype=np.uint8)
+    reasons[missing_name] |= MISSING_NAME
+    # Perbandingan dengan NaN selalu False, jadi NaN hanya ditandai NOT_NUMERIC
+    # (inf juga dianggap bukan angka)
+    with np.errstate(invalid='ignore'):
+        checks = [
+            (~np.isfinite(typed[NUMERIC_COLUMNS].to_numpy()).all(axis=1), NOT_NUMERIC),
+            (values['price'] < 0, NEGATIVE_PRICE),
+            ((values['rating'] < 0) | (values['rating'] > 5), RATING_OUT_OF_RANGE),
+            (values['rating_count'] < 0, NEGATIVE_COUNT),
+            (np.abs(values['latitude']) > 90, LATITUDE_OUT_OF_RANGE),
+            (np.abs(values['longitude']) > 180, LONGITUDE_OUT_OF_RANGE),
+        ]
+    for mask, bit in checks:
+        reasons[mask] |= bit
+
+    bad = np.flatnonzero(reasons)
+    report = RejectReport(bad + row_offset + 1, reasons[bad])
+    return typed, reasons, report
+
+
+def valid_rows(df, row_offset=0):
+    """Return ``(clean_df, report)`` dengan hanya baris yang valid."""
+    typed, reasons, report = validate_wisata(df, row_offset)
+    return typed[reasons == 0], report
@@ -1,13 +1,20 @@
 """
 GUI modules untuk PyQt5 interface.
+
+Kelas halaman di-import saat pertama kali diakses (``from gui import X``),
+sehingga ``import gui.main_window`` tidak memuat semua halaman sekaligus.
 """
 
-from gui.main_window import MainWindow
-from gui.upload_page import UploadPage
-from gui.form_page import FormPage
-from gui.weights_page import WeightsPage
-from gui.process_page import ProcessPage
-from gui.results_page import ResultsPage
+import importlib
+
+_EXPORTS = {
+    'MainWindow': 'gui.main_window',
+    'UploadPage': 'gui.upload_page',
+    'FormPage': 'gui.form_page',
+    'WeightsPage': 'gui.weights_page',
+    'ProcessPage': 'gui.process_page',
+    'ResultsPage': 'gui.results_page',
+}
 
 __all__ = [
     'MainWindow',
@@ -17,3 +24,9 @@ __all__ = [
     'ProcessPage',
     'ResultsPage'
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'gui' has no attribute {name!r}")
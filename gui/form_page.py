@@ -11,6 +11,10 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QDoubleValidator, QIntValidator, QPixmap, QIcon
 import re
 
+import pandas as pd
+
+from core.validation import reason_text, validate_wisata
+
 
 class ValidationLabel(QLabel):
     """Label khusus untuk menampilkan status validasi"""
@@ -154,6 +158,9 @@ class FormPage(QWidget):
         super().__init__(parent)
         self.parent = parent
         self.fields = []
+        # validate() memancarkan validationChanged yang memanggil
+        # update_validation_status lagi; flag ini mencegah rekursi
+        self._updating_validation = False
         self._build()
         
     def _build(self):
@@ -443,6 +450,7 @@ class FormPage(QWidget):
         self.lat_field = lat_field
         self.lon_field = lon_field
         self.save_button = btn_save
+        self.parent.require_db(btn_save, exclusive=True)
         
         # Koneksi validasi
         for field in self.fields:
@@ -452,13 +460,22 @@ class FormPage(QWidget):
         
     def update_validation_status(self):
         """Update status validasi keseluruhan form"""
+        if self._updating_validation:
+            return
+        self._updating_validation = True
+        try:
+            self._update_validation_status()
+        finally:
+            self._updating_validation = False
+
+    def _update_validation_status(self):
         all_valid = True
         error_fields = []
         
         for field in self.fields:
             if not field.validate():
                 all_valid = False
-                error_fields.append(field.label.text().replace('<b>', '').replace('</b>', ''))
+                error_fields.append(field.label)
         
         if all_valid:
             self.validation_panel.setVisible(True)
@@ -498,27 +515,19 @@ class FormPage(QWidget):
                 )
                 return
             
-            # Ambil data
-            row = {
+            # Ambil data lalu validasi dengan aturan yang sama seperti import file
+            raw = pd.DataFrame([{
                 'name': self.name_field.value(),
-                'price': float(self.price_field.value()),
-                'rating': float(self.rwating_field.value()),
-                'rating_count': float(self.count_field.value()),
-                'latitude': float(self.lat_field.value()),
-                'longitude': float(self.lon_field.value())
-            }
-            
-            # Validasi tambahan untuk koordinat
-            if not (-90 <= row['latitude'] <= 90):
-                raise ValueError("Latitude harus antara -90 dan 90")
-            if not (-180 <= row['longitude'] <= 180):
-                raise ValueError("Longitude harus antara -180 dan 180")
-            if row['rating'] < 0 or row['rating'] > 5:
-                raise ValueError("Rating harus antara 0 dan 5")
-            if row['price'] < 0:
-                raise ValueError("Harga tidak boleh negatif")
-            if row['rating_count'] < 0:
-                raise ValueError("Jumlah ulasan tidak boleh negatif")
+                'price': self.price_field.value(),
+                'rating': self.rating_field.value(),
+                'rating_count': self.count_field.value(),
+                'latitude': self.lat_field.value(),
+                'longitude': self.lon_field.value()
+            }])
+            typed, reasons, _ = validate_wisata(raw)
+            if reasons[0]:
+                raise ValueError(reason_text(reasons[0]))
+            row = typed.iloc[0].to_dict()
                 
         except ValueError as e:
             QMessageBox.critical(
@@ -533,28 +542,37 @@ class FormPage(QWidget):
             )
             return
         
-        # Simpan ke database
-        try:
-            from core.database import save_wisata_rows
-            save_wisata_rows([row])
-            
-            # Tampilkan notifikasi sukses
-            msg_box = QMessageBox()
-            msg_box.setWindowTitle("Sukses")
-            msg_box.setIcon(QMessageBox.Information)
-            msg_box.setText("✅ Data berhasil disimpan ke database!")
-            msg_box.setInformativeText(f"Data <b>{row['name']}</b> telah ditambahkan.")
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.exec_()
-            
-            # Clear form setelah sukses
-            self.clear_form()
-            
-        except Exception as e:
-            QMessageBox.critical(
+        # Simpan ke database (di thread database, tidak memblokir GUI)
+        from core.database import save_wisata_rows
+        self.parent.db.submit(
+            save_wisata_rows, [row],
+            on_done=lambda stats: self._on_saved(row, stats),
+            on_error=lambda e: QMessageBox.critical(
                 self, 'Error Database',
                 f'Gagal menyimpan ke database: {str(e)}'
-            )
+            ),
+            label='Menyimpan data wisata...'
+        )
+
+    def _on_saved(self, row, stats):
+        if stats['inserted']:
+            action = "ditambahkan"
+        elif stats['updated']:
+            action = "diperbarui"
+        else:
+            action = "sudah ada tanpa perubahan"
+        
+        # Tampilkan notifikasi sukses
+        msg_box = QMessageBox()
+        msg_box.setWindowTitle("Sukses")
+        msg_box.setIcon(QMessageBox.Information)
+        msg_box.setText("✅ Data berhasil disimpan ke database!")
+        msg_box.setInformativeText(f"Data <b>{row['name']}</b> telah {action}.")
+        msg_box.setStandardButtons(QMessageBox.Ok)
+        msg_box.exec_()
+        
+        # Clear form setelah sukses
+        self.clear_form()
             
     def show_sample_data(self):
         """Tampilkan contoh data untuk testing"""
@@ -1,20 +1,41 @@
 """Main window dengan sidebar navigation dan stacked pages."""
 
+import importlib
+import sys
+
 from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtWidgets import (
-    QListWidget, QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QLabel, QMessageBox
+    QListWidget, QWidget, QHBoxLayout, QVBoxLayout, QPushButton, QLabel, QMessageBox,
+    QProgressBar
 )
 
-from gui.upload_page import UploadPage
-from gui.form_page import FormPage
-from gui.maps_page import MapsPage
-from gui.weights_page import WeightsPage
-from gui.process_page import ProcessPage
-from gui.results_page import ResultsPage
-from core.database import init_db
+from gui import startup
+
+
+# Halaman sesuai urutan sidebar: (atribut, modul, kelas). Modul halaman
+# (pandas, QtWebEngine, matplotlib) baru di-import saat halaman dibuka.
+PAGES = [
+    ('upload_page', 'gui.upload_page', 'UploadPage'),
+    ('maps_page', 'gui.maps_page', 'MapsPage'),
+    ('form_page', 'gui.form_page', 'FormPage'),
+    ('weights_page', 'gui.weights_page', 'WeightsPage'),
+    ('process_page', 'gui.process_page', 'ProcessPage'),
+    ('results_page', 'gui.results_page', 'ResultsPage'),
+]
+PAGE_INDEX = {attr: i for i, (attr, _, _) in enumerate(PAGES)}
+
+
+def _lazy_page(attr):
+    return property(
+        lambda self: self.page(PAGE_INDEX[attr]),
+        doc=f'Halaman ``{attr}``; dibuat saat pertama kali diakses.'
+    )
 
 
 class MainWindow(QtWidgets.QMainWindow):
+    # Dikirim sekali setelah init_db (migrasi) selesai di thread database
+    dbReady = QtCore.pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("AHP 1 TOPSIS - Destinasi Wisata")
@@ -43,7 +64,18 @@ class MainWindow(QtWidgets.QMainWindow):
         # Range: 180-280px based on screen width percentage
         self._sidebar_width = int(max(180, min(280, sw * 0.15)))
 
-        init_db()
+        # Thread database, init_db dan halaman pertama disiapkan setelah
+        # jendela pertama kali digambar (lihat _finish_startup)
+        self.db = None
+        self.db_ready = False
+        # Profil user tersimpan (bobot terakhir), dimuat bersama init_db
+        self.saved_profile = None
+        # True selama IngestWorker memegang transaksi tulis (lihat UploadPage)
+        self.ingest_running = False
+        # Widget yang bergantung pada database: (widget, exclusive)
+        self._db_widgets = []
+        self._pages = {}
+        self._startup_done = False
 
         # ======================================================
         # MAIN ROOT LAYOUT
@@ -169,30 +201,183 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pages.setMinimumWidth(int(max(480, win_w - self._sidebar_width - 80)))
         content_layout.addWidget(self.pages, stretch=1)
 
-        # Register Pages
-        self.upload_page = UploadPage(self)
-        self.maps_page = MapsPage(self)
-        self.form_page = FormPage(self)
-        self.weights_page = WeightsPage(self)
-        self.process_page = ProcessPage(self)
-        self.results_page = ResultsPage(self)
-
-        self.pages.addWidget(self.upload_page)   # index 0
-        self.pages.addWidget(self.maps_page)     # index 1
-        self.pages.addWidget(self.form_page)     # index 2
-        self.pages.addWidget(self.weights_page)  # index 3
-        self.pages.addWidget(self.process_page)  # index 4
-        self.pages.addWidget(self.results_page)  # index 5
+        # Register Pages: placeholder kosong, diganti halaman asli saat dibuka
+        for _ in PAGES:
+            self.pages.addWidget(QWidget())
 
         # Bind Sidebar → Page Switch
-        self.sidebar.currentRowChanged.connect(self.pages.setCurrentIndex)
-        self.sidebar.setCurrentRow(0)
+        self.sidebar.currentRowChanged.connect(self.show_page)
 
         root_layout.addWidget(content)
 
         # Set final widget
         self.setCentralWidget(root)
 
+        # Indikator proses database di status bar
+        self.busy_label = QLabel()
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setMaximumWidth(160)
+        self.statusBar().addPermanentWidget(self.busy_label)
+        self.statusBar().addPermanentWidget(self.busy_bar)
+        self.busy_label.hide()
+        self.busy_bar.hide()
+
+    # ==========================================================
+    # STARTUP & LAZY PAGES
+    # ==========================================================
+    upload_page = _lazy_page('upload_page')
+    maps_page = _lazy_page('maps_page')
+    form_page = _lazy_page('form_page')
+    weights_page = _lazy_page('weights_page')
+    process_page = _lazy_page('process_page')
+    results_page = _lazy_page('results_page')
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._startup_done:
+            startup.mark('first_paint')
+            # Lanjutkan startup setelah event paint ini selesai diproses
+            QtCore.QTimer.singleShot(0, self._finish_startup)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Cadangan jika platform tidak mengirim event paint (misal offscreen)
+        QtCore.QTimer.singleShot(100, self._finish_startup)
+
+    def _finish_startup(self):
+        if self._startup_done:
+            return
+        self._startup_done = True
+        self._start_database()
+        self.sidebar.setCurrentRow(0)
+        startup.mark('first_page')
+
+    def _start_database(self):
+        """Buat thread database dan jalankan init_db (migrasi) di sana.
+
+        Tugas yang di-submit ke ``self.db`` berjalan berurutan di satu thread,
+        sehingga selalu dieksekusi setelah init_db. Aksi lain menunggu
+        :attr:`dbReady` (lihat :meth:`require_db`).
+        """
+        if self.db is not None:
+            return
+        from core.database import DEFAULT_PROFILE, init_db, load_user_profile
+        from gui.workers import AsyncDatabase
+
+        # Semua query berat dijalankan di thread worker database
+        self.db = AsyncDatabase(self)
+        self.db.busyChanged.connect(self._on_db_busy)
+        self.db.submit(
+            self._init_database, init_db, lambda: load_user_profile(DEFAULT_PROFILE),
+            label='Menyiapkan database...', on_done=self._on_db_ready,
+            on_error=self._on_db_error
+        )
+
+    @staticmethod
+    def _init_database(init_db, load_profile):
+        """Migrasi lalu muat profil; halaman bobot membacanya saat dbReady."""
+        with startup.phase('init_db'):
+            init_db()
+        return load_profile()
+
+    def _on_db_ready(self, profile):
+        self.saved_profile = profile
+        self.db_ready = True
+        self._update_db_widgets()
+        startup.mark('init_db')
+        self.statusBar().showMessage(f'Siap — startup: {startup.format_report()}', 8000)
+        self.dbReady.emit()
+
+    def _on_db_error(self, e):
+        QMessageBox.critical(self, 'Error', f'Gagal menyiapkan database:\n{e}')
+
+    def when_db_ready(self, callback):
+        """Panggil ``callback`` setelah init_db selesai (langsung jika sudah)."""
+        if self.db_ready:
+            callback()
+        else:
+            self.dbReady.connect(callback)
+
+    def require_db(self, *widgets, exclusive=False):
+        """Nonaktifkan ``widgets`` sampai init_db (migrasi) selesai.
+
+        Aksi yang membaca/menulis database di luar :class:`AsyncDatabase`
+        (IngestWorker, RankingWorker) tidak boleh berjalan terhadap skema
+        lama. Dengan ``exclusive=True`` widget juga nonaktif selama import
+        berjalan: tulisan lain akan menunggu transaksi import (dan menahan
+        thread database) sampai ``BUSY_TIMEOUT``.
+        """
+        self._db_widgets += [(widget, exclusive) for widget in widgets]
+        self._update_db_widgets()
+
+    def set_ingest_running(self, running):
+        """Dipanggil UploadPage saat IngestWorker mulai/selesai."""
+        self.ingest_running = running
+        self._update_db_widgets()
+
+    def _update_db_widgets(self):
+        for widget, exclusive in self._db_widgets:
+            widget.setEnabled(self.db_ready and not (exclusive and self.ingest_running))
+
+    def page(self, index):
+        """Halaman pada ``index`` sidebar; modul di-import dan halaman dibuat sekali."""
+        attr, module_name, class_name = PAGES[index]
+        page = self._pages.get(attr)
+        if page is None:
+            self._start_database()
+            with startup.phase(f'import {module_name}'):
+                cls = getattr(importlib.import_module(module_name), class_name)
+            with startup.phase(f'construct {class_name}'):
+                page = self._pages[attr] = cls(self)
+
+            placeholder = self.pages.widget(index)
+            was_current = self.pages.currentWidget() is placeholder
+            self.pages.insertWidget(index, page)
+            self.pages.removeWidget(placeholder)
+            placeholder.deleteLater()
+            if was_current:
+                self.pages.setCurrentIndex(index)
+        return page
+
+    def loaded_page(self, attr):
+        """Halaman ``attr`` jika sudah dibuat, tanpa membuatnya (None jika belum)."""
+        return self._pages.get(attr)
+
+    def show_page(self, index):
+        if index < 0:
+            return
+        self.page(index)
+        self.pages.setCurrentIndex(index)
+
+    def _on_db_busy(self, busy, label):
+        """Tampilkan/sembunyikan indikator saat thread database bekerja."""
+        self.busy_label.setText(label)
+        self.busy_label.setVisible(busy and bool(label))
+        self.busy_bar.setVisible(busy)
+        if not busy:
+            self.statusBar().clearMessage()
+
+    def closeEvent(self, event):
+        """Simpan snapshot catalog agar start berikutnya tidak membaca SQLite."""
+        # Batalkan import/ranking yang berjalan (rollback) dan selesaikan tugas
+        # database yang masih antri sebelum keluar
+        upload_page = self.loaded_page('upload_page')
+        if upload_page is not None:
+            upload_page.stop_ingest()
+        process_page = self.loaded_page('process_page')
+        if process_page is not None:
+            process_page.stop_ranking()
+        if self.db is not None:
+            # Snapshot hanya ditulis dari catalog yang sudah di-cache sesi ini
+            # (tanpa membaca ulang tabel), di thread database sebelum shutdown
+            from core.database import save_snapshot
+            snapshot = self.db.submit(save_snapshot, cached_only=True)
+            self.db.shutdown()
+            if snapshot.exception() is not None:
+                print(f'Gagal menyimpan snapshot catalog: {snapshot.exception()}', file=sys.stderr)
+        super().closeEvent(event)
+
     # ==========================================================
     # TOPBAR BUTTON HANDLERS
     # ==========================================================
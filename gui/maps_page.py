@@ -11,7 +11,7 @@ from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtCore import pyqtSlot, QObject, QUrl, Qt, pyqtSignal, QTimer
 from PyQt5.QtGui import QFont
 
-from core.database import save_user_location, load_user_location, init_db
+from core.database import save_user_location, load_user_location
 
 
 class Bridge(QObject):
@@ -44,8 +44,14 @@ class Bridge(QObject):
         self.web_page_loaded = True
         print("Map page loaded successfully")
         
-        # Coba muat lokasi terakhir jika ada
-        lat, lng, _ = load_user_location()
+        # Coba muat lokasi terakhir jika ada (di thread database, setelah init_db)
+        self.parent.parent.db.submit(
+            load_user_location, on_done=self._on_last_location,
+            label='Memuat lokasi terakhir...'
+        )
+
+    def _on_last_location(self, location):
+        lat, lng, _ = location
         if lat is not None and lng is not None:
             # Kirim lokasi ke JavaScript
             self.updateMapSignal.emit(lat, lng, "last_location")
@@ -74,9 +80,6 @@ class MapsPage(QWidget):
         self.lng_box = None
         self.web = None
         
-        # Initialize database
-        init_db()
-        
         # Build UI and setup web channel BEFORE loading the HTML to avoid
         # race where the page's QWebChannel JS executes before Python side is ready.
         self._build()
@@ -526,45 +529,57 @@ class MapsPage(QWidget):
         """
     
     def save_location(self):
-        """Save location ke database."""
+        """Save location ke database (di thread database)."""
         if self.current_lat is None or self.current_lng is None:
             QMessageBox.warning(self, 'Perhatian', 'Silakan pilih lokasi terlebih dahulu.')
             return
         
-        try:
-            # Konfirmasi sebelum simpan
-            reply = QMessageBox.question(
-                self, 'Konfirmasi',
-                f'Simpan lokasi ini?\n\nLatitude: {self.current_lat:.6f}\nLongitude: {self.current_lng:.6f}',
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.Yes
-            )
-            
-            if reply == QMessageBox.Yes:
-                save_user_location(self.current_lat, self.current_lng)
-                
-                # Show success message
-                msg = QMessageBox(self)
-                msg.setIcon(QMessageBox.Information)
-                msg.setWindowTitle('Sukses')
-                msg.setText('Lokasi berhasil disimpan!')
-                msg.setInformativeText(
-                    f'Koordinat yang disimpan:\n'
-                    f'• Latitude: {self.current_lat:.6f}\n'
-                    f'• Longitude: {self.current_lng:.6f}'
-                )
-                msg.setStandardButtons(QMessageBox.Ok)
-                msg.exec_()
-                
-                # Update status
-                self.status_label.setText("Lokasi berhasil disimpan ke database")
-                self.status_label.setStyleSheet("color: #27ae60; font-weight: bold;")
-                
-        except Exception as e:
-            QMessageBox.critical(
-                self, 'Error',
-                f'Gagal menyimpan lokasi:\n{str(e)}'
-            )
+        # Konfirmasi sebelum simpan
+        reply = QMessageBox.question(
+            self, 'Konfirmasi',
+            f'Simpan lokasi ini?\n\nLatitude: {self.current_lat:.6f}\nLongitude: {self.current_lng:.6f}',
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        
+        if reply != QMessageBox.Yes:
+            return
+        
+        lat, lng = self.current_lat, self.current_lng
+        self.status_label.setText("Menyimpan lokasi...")
+        self.status_label.setStyleSheet("color: #7f8c8d;")
+        self.parent.db.submit(
+            save_user_location, lat, lng,
+            on_done=lambda _: self._on_location_saved(lat, lng),
+            on_error=self._on_location_error,
+            label='Menyimpan lokasi...'
+        )
+    
+    def _on_location_saved(self, lat, lng):
+        # Show success message
+        msg = QMessageBox(self)
+        msg.setIcon(QMessageBox.Information)
+        msg.setWindowTitle('Sukses')
+        msg.setText('Lokasi berhasil disimpan!')
+        msg.setInformativeText(
+            f'Koordinat yang disimpan:\n'
+            f'• Latitude: {lat:.6f}\n'
+            f'• Longitude: {lng:.6f}'
+        )
+        msg.setStandardButtons(QMessageBox.Ok)
+        msg.exec_()
+        
+        # Update status
+        self.status_label.setText("Lokasi berhasil disimpan ke database")
+        self.status_label.setStyleSheet("color: #27ae60; font-weight: bold;")
+    
+    def _on_location_error(self, e):
+        self.status_label.setText("Gagal menyimpan lokasi")
+        self.status_label.setStyleSheet("color: #e74c3c;")
+        QMessageBox.critical(
+            self, 'Error',
+            f'Gagal menyimpan lokasi:\n{str(e)}'
+        )
     
     def reset_location(self):
         """Reset lokasi yang dipilih."""
@@ -591,7 +606,13 @@ class MapsPage(QWidget):
     
     def load_last_location(self):
         """Load lokasi terakhir dari database."""
-        lat, lng, _ = load_user_location()
+        self.parent.db.submit(
+            load_user_location, on_done=self._show_last_location,
+            label='Memuat lokasi terakhir...'
+        )
+
+    def _show_last_location(self, location):
+        lat, lng, _ = location
         if lat is not None and lng is not None:
             self.current_lat = lat
             self.current_lng = lng
@@ -2,109 +2,199 @@
 Process page untuk menjalankan TOPSIS calculation dan menampilkan hasil.
 """
 
-import pandas as pd
+import time
+
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMessageBox, QTableView, QHeaderView,
+    QLabel, QProgressBar
 )
 
-from core.database import load_wisata_db, load_user_location
-from core.haversine import haversine_km
-from core.topsis import topsis_rank
+from core.database import DEFAULT_PROFILE, save_user_profile
+from core.ranking import criteria_plan
+from gui.table_models import ColumnarTableModel
+from gui.workers import RankingWorker
 
 
 class ProcessPage(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        # Nomor permintaan terbaru; hasil dari worker lama diabaikan
+        self._ranking_generation = 0
+        self._ranking_worker = None
+        self._ranking_started = 0.0
         self._build()
+        self.parent.require_db(self.btn_calc)
 
     def _build(self):
         layout = QVBoxLayout()
 
-        btn_calc = QPushButton('Hitung Jarak & Jalankan TOPSIS')
-        btn_calc.clicked.connect(self.run_full_process)
-        layout.addWidget(btn_calc)
-
-        self.process_table = QTableWidget()
+        self.btn_calc = QPushButton('Hitung Jarak & Jalankan TOPSIS')
+        self.btn_calc.clicked.connect(self.run_full_process)
+        layout.addWidget(self.btn_calc)
+
+        progress_row = QHBoxLayout()
+        self.status_label = QLabel()
+        self.stage_bar = QProgressBar()
+        self.stage_bar.setVisible(False)
+        self.btn_cancel = QPushButton('Batal')
+        self.btn_cancel.setVisible(False)
+        self.btn_cancel.clicked.connect(self.cancel_ranking)
+        progress_row.addWidget(self.status_label)
+        progress_row.addWidget(self.stage_bar)
+        progress_row.addWidget(self.btn_cancel)
+        layout.addLayout(progress_row)
+
+        self.process_model = ColumnarTableModel([], parent=self)
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_model)
+        self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.process_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         layout.addWidget(self.process_table)
 
         self.setLayout(layout)
 
     def run_full_process(self):
-        """Load data, calculate distance, and run TOPSIS."""
-        df = load_wisata_db()
+        """Load data, calculate distance, and run TOPSIS.
+
+        Pipeline berjalan di :class:`gui.workers.RankingWorker`. Permintaan
+        baru membatalkan permintaan yang masih berjalan, sehingga klik
+        berulang tidak menumpuk pekerjaan.
+        """
+        weights = self.parent.weights_page.current_weights()
+        self._save_weights(weights)
+        self._start_ranking(weights)
+        self.status_label.setText('Menghitung ranking...')
+        self.stage_bar.setValue(0)
+        self.stage_bar.setVisible(True)
+        self.btn_cancel.setVisible(True)
+
+    def _save_weights(self, weights):
+        """Simpan bobot ke profil (dipakai lagi saat start berikutnya).
+
+        Dijalankan di thread database, terpisah dari ranking, agar ranking
+        tidak ikut menunggu jika ingest sedang menulis.
+        """
+        self.parent.db.submit(
+            save_user_profile, DEFAULT_PROFILE, weights=weights,
+            criteria_plan=criteria_plan(), label='Menyimpan bobot...',
+            on_error=lambda e: self.parent.statusBar().showMessage(
+                f'Gagal menyimpan bobot: {e}', 8000
+            )
+        )
+
+    def run_live(self, weights):
+        """Re-score cepat untuk mode live di halaman bobot (hanya top-k baris)."""
+        self._start_ranking(weights, live=True)
+        # Perhitungan penuh yang mungkin masih berjalan sudah dibatalkan
+        self.status_label.clear()
+        self.stage_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
+
+    def _start_ranking(self, weights, live=False):
+        if self._ranking_worker is not None:
+            self._ranking_worker.cancel()
+
+        self._ranking_generation += 1
+        worker = RankingWorker(
+            weights, generation=self._ranking_generation, live=live, parent=self
+        )
+        worker.progress.connect(self._on_ranking_progress)
+        worker.completed.connect(self._on_ranking_completed)
+        worker.finished.connect(worker.deleteLater)
+        self._ranking_worker = worker
+        self._ranking_started = time.perf_counter()
+        worker.start()
+
+    def cancel_ranking(self):
+        if self._ranking_worker is not None:
+            self._ranking_worker.cancel()
+            self.status_label.setText('Membatalkan...')
+
+    def stop_ranking(self):
+        """Batalkan ranking yang berjalan dan tunggu semua worker selesai."""
+        for worker in self.findChildren(RankingWorker):
+            worker.cancel()
+            worker.wait()
+
+    def _on_ranking_progress(self, generation, label, step, total):
+        if generation != self._ranking_generation or self._ranking_worker.live:
+            return
+        self.stage_bar.setRange(0, total)
+        self.stage_bar.setValue(step)
+        self.status_label.setText(f'{label}...')
+
+    def _on_ranking_completed(self, summary):
+        if summary['generation'] != self._ranking_generation:
+            return  # digantikan permintaan yang lebih baru
+
+        live = self._ranking_worker.live
+        self._ranking_worker = None
+        if live:
+            self._on_live_completed(summary)
+            return
 
-        if df.empty:
+        self.status_label.clear()
+        self.stage_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
+
+        status = summary['status']
+        if status == 'cancelled':
+            self.status_label.setText('Perhitungan dibatalkan.')
+            return
+        if status == 'error':
+            QMessageBox.critical(
+                self, 'Error', f'Gagal menjalankan TOPSIS:\n{summary["error"]}'
+            )
+            return
+        if status == 'empty':
             QMessageBox.critical(
                 self, 'Error',
                 'Tidak ada data wisata. Upload atau muat dari DB dulu.'
             )
             return
-
-        lat, lon, _ = load_user_location()
-
-        if lat is None:
+        if status == 'no_location':
             QMessageBox.critical(
                 self, 'Error',
                 'Lokasi user belum disetel. Masukkan di tab Lokasi User.'
             )
             return
 
-        # Calculate distance
-        df['distance_km'] = df.apply(
-            lambda r: haversine_km(
-                lat, lon,
-                float(r['latitude']), float(r['longitude'])
-            ),
-            axis=1
-        )
-
-        # Convert to numeric
-        df['price'] = pd.to_numeric(df['price'], errors='coerce')
-        df['rating'] = pd.to_numeric(df['rating'], errors='coerce')
-        df['rating_count'] = pd.to_numeric(df['rating_count'], errors='coerce')
-        df['distance_km'] = pd.to_numeric(df['distance_km'], errors='coerce')
-
-        # Get weights from weights_page
-        wpage = self.parent.weights_page
-        w = [
-            wpage.spin_price.value(),
-            wpage.spin_rating.value(),
-            wpage.spin_count.value(),
-            wpage.spin_dist.value()
-        ]
-
-        # Normalize weights
-        w = pd.Series(w, dtype=float)
-        if w.sum() == 0:
-            nw = (w + 1) / (w.size + w.sum())
-        else:
-            nw = w / w.sum()
-
-        # Run TOPSIS
-        matrix = df[['price', 'rating', 'rating_count', 'distance_km']].copy()
-        scores = topsis_rank(
-            matrix, nw.values,
-            ['cost', 'benefit', 'benefit', 'cost']
-        )
-
-        df['topsis_score'] = scores
-        df['rank'] = df['topsis_score'].rank(ascending=False, method='min').astype(int)
-
-        self.parent.latest_results = df.sort_values('rank')
+        df = summary['results']
+        self.parent.latest_results = df
+        # Hasil lengkap menggantikan hasil live sebelumnya
+        self.parent.latest_live = None
         self._show_process_table(df)
+        self.parent.results_page.show_results()
 
         # Navigate to results tab (index 5)
         self.parent.pages.setCurrentIndex(5)
 
+    def _on_live_completed(self, summary):
+        """Kirim top-k ke halaman hasil dan laporkan latensi ke halaman bobot."""
+        messages = {
+            'empty': 'Tidak ada data wisata.',
+            'no_location': 'Lokasi user belum disetel.',
+            'error': f'Gagal menghitung ranking: {summary.get("error")}',
+        }
+        status = summary['status']
+        if status == 'cancelled':
+            return
+        if status != 'done':
+            self.parent.weights_page.set_live_status(messages[status])
+            return
+
+        df = summary['results']
+        # Disimpan agar membuka tab Hasil menampilkan ranking live terbaru,
+        # bukan hasil proses lengkap yang lebih lama
+        self.parent.latest_live = df
+        self.parent.results_page.show_live_results(df)
+        elapsed_ms = (time.perf_counter() - self._ranking_started) * 1000
+        self.parent.weights_page.set_live_status(
+            f'Top {len(df)} diperbarui dalam {elapsed_ms:.0f} ms', df['name'].head(3).tolist()
+        )
+
     def _show_process_table(self, df):
         """Display results in table."""
-        cols = list(df.columns)
-        self.process_table.setColumnCount(len(cols))
-        self.process_table.setRowCount(len(df))
-        self.process_table.setHorizontalHeaderLabels(cols)
-        self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-
-        for i, (_, row) in enumerate(df.iterrows()):
-            for j, col in enumerate(cols):
-                self.process_table.setItem(i, j, QTableWidgetItem(str(row[col])))
+        self.process_model.set_columns(df.columns)
+        self.process_model.set_frame(df)
@@ -5,26 +5,39 @@ Results page untuk menampilkan dan export hasil ranking wisata dengan UI yang le
 import pandas as pd
 import numpy as np
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView,
+    QWidget, QVBoxLayout, QPushButton, QTableView, QHeaderView,
     QFileDialog, QMessageBox, QHBoxLayout, QLabel, QFrame, QGroupBox, QProgressBar,
     QGridLayout, QTabWidget, QTextEdit, QScrollArea, QSizePolicy, QSplitter,
     QToolButton, QMenu, QStyle
 )
 from PyQt5.QtWidgets import QLineEdit, QComboBox
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from PyQt5.QtGui import QFont, QColor, QBrush, QIcon, QPixmap
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import seaborn as sns
+from PyQt5.QtGui import QFont, QIcon, QPixmap
 from datetime import datetime
 
+from gui.table_models import ResultsTableModel
+
 
 class ScoreVisualization(QWidget):
     """Widget untuk visualisasi skor TOPSIS"""
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.figure, self.ax = plt.subplots(figsize=(8, 4))
+        # matplotlib di-import saat widget dibuat (bukan saat startup); Figure
+        # dipakai langsung tanpa pyplot karena canvas dikelola Qt
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=(8, 4))
+        self.ax = self.figure.add_subplot(111)
         self.canvas = FigureCanvas(self.figure)
+
+        # Artist bar/label yang dipakai ulang antar update (lihat _update_bars)
+        self._bars = []
+        self._labels = []
+        self._names = []
+        # Figure tanpa artist animasi, disalin setiap kali canvas digambar penuh
+        self._background = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
         self._build()
         
     def _build(self):
@@ -33,28 +46,44 @@ class ScoreVisualization(QWidget):
         self.setLayout(layout)
         
     def plot_scores(self, df):
-        """Plot bar chart untuk skor TOPSIS"""
+        """Plot bar chart untuk skor TOPSIS.
+
+        Jika jumlah bar sama dengan plot sebelumnya, bar dan label yang ada
+        dipakai ulang tanpa menghitung ulang layout (lihat :meth:`_update_bars`).
+        """
+        # Sort by rank, ambil top 15 untuk visualisasi yang lebih baik
+        df_plot = df.sort_values('rank').head(15)
+        scores = df_plot['topsis_score'].to_numpy(dtype=float)
+        names = [str(name) for name in df_plot['name']]
+
+        if self._bars and len(self._bars) == len(scores):
+            self._update_bars(scores, names)
+        else:
+            self._redraw(scores, names)
+
+    def _redraw(self, scores, names):
+        """Bangun ulang axes, bar dan label lalu hitung layout."""
         self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        
-        # Sort by rank
-        df_sorted = df.sort_values('rank')
+        self._background = None
+        ax = self.ax = self.figure.add_subplot(111)
         
-        # Ambil top 15 untuk visualisasi yang lebih baik
-        df_plot = df_sorted.head(15)
+        from matplotlib import cm
+        colors = cm.YlOrRd(np.linspace(0.4, 0.9, len(scores)))
         
-        colors = plt.cm.YlOrRd(np.linspace(0.4, 0.9, len(df_plot)))
-        
-        bars = ax.barh(range(len(df_plot)), df_plot['topsis_score'], color=colors)
+        # Bar dan label digambar sendiri (animated) agar bisa di-blit saat update
+        bars = ax.barh(range(len(scores)), scores, color=colors, animated=True)
         
         # Tambah nilai di ujung bar
-        for i, (bar, score) in enumerate(zip(bars, df_plot['topsis_score'])):
-            width = bar.get_width()
-            ax.text(width + 0.01, bar.get_y() + bar.get_height()/2,
-                   f'{score:.3f}', ha='left', va='center', fontsize=9)
-        
-        ax.set_yticks(range(len(df_plot)))
-        ax.set_yticklabels(df_plot['name'], fontsize=9)
+        labels = []
+        for bar, score in zip(bars, scores):
+            labels.append(ax.text(
+                score + 0.01, bar.get_y() + bar.get_height()/2, f'{score:.3f}',
+                ha='left', va='center', fontsize=9, animated=True
+            ))
+        self._bars, self._labels, self._names = list(bars), labels, names
+        
+        ax.set_yticks(range(len(scores)))
+        ax.set_yticklabels(names, fontsize=9)
         ax.invert_yaxis()  # Rank tertinggi di atas
         ax.set_xlabel('TOPSIS Score', fontsize=10, fontweight='bold')
         ax.set_title('Top 15 Rekomendasi Wisata', fontsize=12, fontweight='bold')
@@ -63,6 +92,52 @@ class ScoreVisualization(QWidget):
         self.figure.tight_layout()
         self.canvas.draw()
 
+    def _update_bars(self, scores, names):
+        """Perbarui lebar bar dan teks label yang ada.
+
+        Jika nama (tick label) dan batas sumbu x tidak berubah, hanya bar dan
+        label yang digambar ulang di atas background yang di-cache (blit);
+        selain itu canvas digambar ulang penuh, tetap tanpa ``tight_layout``.
+        """
+        changed = False
+        for bar, label, score in zip(self._bars, self._labels, scores):
+            if bar.get_width() != score:
+                bar.set_width(score)
+                label.set_x(score + 0.01)
+                label.set_text(f'{score:.3f}')
+                changed = True
+
+        full_draw = False
+        if names != self._names:
+            self.ax.set_yticklabels(names, fontsize=9)
+            self._names = names
+            full_draw = True
+
+        # Sumbu x hanya di-autoscale ulang jika bar terpanjang keluar batas
+        # atau jauh lebih pendek (menghindari tick berubah di setiap update)
+        top = scores.max(initial=0.0)
+        xmax = self.ax.get_xlim()[1]
+        if top > xmax or top < xmax / 2:
+            self.ax.relim()
+            self.ax.autoscale_view(scaley=False)
+            full_draw = True
+
+        if full_draw or self._background is None or not self.isVisible():
+            self.canvas.draw_idle()
+        elif changed:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+
+    def _draw_animated(self):
+        for artist in self._bars + self._labels:
+            self.ax.draw_artist(artist)
+
+    def _on_draw(self, event):
+        """Simpan background setelah draw penuh lalu gambar bar dan label."""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
 
 class ResultsPage(QWidget):
     """Halaman hasil ranking dengan visualisasi yang kaya"""
@@ -184,20 +259,23 @@ class ResultsPage(QWidget):
         filter_layout.addStretch()
         layout.addLayout(filter_layout)
         
-        # Tabel
-        self.results_table = QTableWidget()
+        # Tabel (model/view; sort dan filter memakai array index, lihat ResultsTableModel)
+        self.results_model = ResultsTableModel([], parent=self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 alternate-background-color: #f9f9f9;
                 gridline-color: #ddd;
                 font-size: 10pt;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #3498db;
                 color: white;
             }
@@ -389,12 +467,22 @@ class ResultsPage(QWidget):
         """)
         btn_delete_db.clicked.connect(self.confirm_delete_db)
         layout.addWidget(btn_delete_db)
+        self.parent.require_db(btn_reset, btn_delete_db, exclusive=True)
         
         panel.setLayout(layout)
         return panel
         
     def show_results(self):
-        """Display results in table and update all views."""
+        """Display results in table and update all views.
+
+        Jika ada hasil mode live yang lebih baru (``latest_live``), hasil
+        itu yang ditampilkan.
+        """
+        live = getattr(self.parent, 'latest_live', None)
+        if live is not None:
+            if self.df_results is not live:
+                self.show_live_results(live)
+            return
         if getattr(self.parent, 'latest_results', None) is None:
             return
             
@@ -482,13 +570,29 @@ class ResultsPage(QWidget):
                     best_name = best_name[:27] + "..."
                 self.stat_best.setText(f"Rekomendasi Terbaik: {best_name}")
                 
-    def _update_table(self):
-        """Update tabel hasil"""
-        if self.df_results is None:
-            return
-            
-        df = self.df_results.copy()
-        
+    def show_live_results(self, df):
+        """Tampilkan top-k hasil dari mode live halaman bobot.
+
+        Jika kolom dan jumlah baris sama dengan tampilan sebelumnya, model
+        hanya me-repaint baris yang berubah (tanpa reset tabel).
+        """
+        self.df_results = df
+        self._format_numeric_columns()
+        self._update_stats_panel()
+
+        columns = list(self._display_columns(self.df_results))
+        if columns != self.results_model.columns or len(df) != self.results_model.rowCount():
+            self._update_table()
+        else:
+            self.results_model.update_frame(self.df_results)
+            if self.filter_input.text() or self.filter_combo.currentText() != "Semua":
+                self.filter_table()
+
+        # Chart memakai ulang bar yang ada (lihat ScoreVisualization.plot_scores)
+        self.update_visualization()
+
+    def _display_columns(self, df):
+        """Kolom yang ditampilkan (key -> label header), sesuai kolom ``df``."""
         # Pilih kolom untuk ditampilkan dengan nama yang lebih user-friendly
         display_cols = {
             'rank': 'Rank',
@@ -507,116 +611,61 @@ class ResultsPage(QWidget):
         if 'latitude' in df.columns and 'longitude' in df.columns:
             available_cols['latitude'] = 'Latitude'
             available_cols['longitude'] = 'Longitude'
+        return available_cols
+
+    def _update_table(self):
+        """Update tabel hasil"""
+        if self.df_results is None:
+            return
+            
+        df = self.df_results
+        available_cols = self._display_columns(df)
         
-        # Setup tabel
-        self.results_table.setColumnCount(len(available_cols))
-        self.results_table.setRowCount(len(df))
-        self.results_table.setHorizontalHeaderLabels(list(available_cols.values()))
-        # Save mapping for filtered display
+        # Setup tabel: model membaca kolom langsung, sel diformat saat terlihat
         self.display_cols = available_cols
+        self.results_model.set_columns(list(available_cols), list(available_cols.values()))
+        self.results_model.set_frame(df)
         
-        # Isi data
-        for i, (_, row) in enumerate(df.iterrows()):
-            for j, (col_key, col_name) in enumerate(available_cols.items()):
-                val = row[col_key]
-                
-                # Format khusus untuk tipe data tertentu
-                if col_key == 'price' and isinstance(val, (int, float)):
-                    display_val = f"Rp{val:,}"
-                elif col_key == 'rating_count' and isinstance(val, (int, float)):
-                    display_val = f"{val:,}"
-                elif col_key in ['distance_km', 'topsis_score', 'rating'] and isinstance(val, float):
-                    if col_key == 'distance_km':
-                        display_val = f"{val:.2f} km"
-                    elif col_key == 'topsis_score':
-                        display_val = f"{val:.4f}"
-                    else:
-                        display_val = f"{val:.2f}"
-                else:
-                    display_val = str(val)
-                    
-                item = QTableWidgetItem(display_val)
-                
-                # Warna berdasarkan rank
-                if col_key == 'rank':
-                    if val == 1:
-                        item.setBackground(QColor(255, 255, 204))  # Kuning muda
-                        item.setForeground(QBrush(QColor(0, 0, 0)))
-                    elif val <= 3:
-                        item.setBackground(QColor(204, 255, 204))  # Hijau muda
-                    elif val <= 10:
-                        item.setBackground(QColor(224, 224, 255))  # Biru muda
-                        
-                self.results_table.setItem(i, j, item)
-        
-        # Atur resize mode
+        # Atur lebar kolom sekali (ResizeToContents akan mengukur ulang setiap filter)
         header = self.results_table.horizontalHeader()
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.Stretch)  # Nama wisata lebih lebar
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        self.results_table.resizeColumnsToContents()
+        if 'name' in available_cols:
+            header.setSectionResizeMode(list(available_cols).index('name'), QHeaderView.Stretch)
         
         # Sort by rank secara default
-        self.results_table.sortItems(0, Qt.AscendingOrder)
+        self.results_table.sortByColumn(0, Qt.AscendingOrder)
+        if self.filter_input.text() or self.filter_combo.currentText() != "Semua":
+            self.filter_table()
         
     def filter_table(self):
-        """Filter tabel berdasarkan input"""
+        """Filter tabel berdasarkan input (boolean mask, tanpa menyalin data)"""
         if self.df_results is None:
             return
             
-        search_text = self.filter_input.text().lower()
         filter_type = self.filter_combo.currentText()
         
-        df = self.df_results.copy()
-        
         # Filter berdasarkan teks pencarian
-        if search_text:
-            df = df[df['name'].str.lower().str.contains(search_text)]
+        mask = self.results_model.search_mask(self.filter_input.text())
             
         # Filter berdasarkan tipe
-        if filter_type == "Top 10":
-            df = df.head(10)
-        elif filter_type == "Top 20":
-            df = df.head(20)
+        if filter_type in ("Top 10", "Top 20"):
+            top = np.flatnonzero(mask)[:int(filter_type.split()[1])]
+            mask = np.zeros_like(mask)
+            mask[top] = True
         elif filter_type == "Rating > 4":
-            df = df[df['rating'] > 4]
+            mask &= self.df_results['rating'].to_numpy() > 4
         elif filter_type == "Harga < 100k":
-            df = df[df['price'] < 100000]
+            mask &= self.df_results['price'].to_numpy() < 100000
             
-        # Update tabel dengan data yang difilter
-        self._display_filtered_table(df)
-        
-    def _display_filtered_table(self, df):
-        """Tampilkan tabel dengan data yang sudah difilter"""
-        self.results_table.setRowCount(len(df))
-        
-        for i, (_, row) in enumerate(df.iterrows()):
-            for j in range(self.results_table.columnCount()):
-                col_key = list(self.display_cols.keys())[j]
-                val = row[col_key]
-                
-                # Format yang sama seperti sebelumnya
-                if col_key == 'price' and isinstance(val, (int, float)):
-                    display_val = f"Rp{val:,}"
-                elif col_key == 'rating_count' and isinstance(val, (int, float)):
-                    display_val = f"{val:,}"
-                elif col_key in ['distance_km', 'topsis_score', 'rating'] and isinstance(val, float):
-                    if col_key == 'distance_km':
-                        display_val = f"{val:.2f} km"
-                    elif col_key == 'topsis_score':
-                        display_val = f"{val:.4f}"
-                    else:
-                        display_val = f"{val:.2f}"
-                else:
-                    display_val = str(val)
-                    
-                item = QTableWidgetItem(display_val)
-                self.results_table.setItem(i, j, item)
+        self.results_model.set_filter(mask)
                 
     def update_visualization(self):
         """Update visualisasi"""
         if self.df_results is None or self.viz_widget is None:
             return
             
-        df = self.df_results.copy()
+        df = self.df_results
         
         # Filter berdasarkan pilihan
         viz_type = self.viz_count.currentText()
@@ -804,67 +853,69 @@ class ResultsPage(QWidget):
         if reply == QMessageBox.Yes:
             self.delete_db_file()
 
+    @staticmethod
+    def _recreate_database():
+        """Hapus file database lalu buat ulang skema kosong (thread database)."""
+        from core.database import delete_database_file, init_db
+
+        deleted = delete_database_file()
+        # Recreate empty DB so app continues to work
+        init_db()
+        return deleted
+
     def delete_db_file(self):
         """Delete the database file and recreate an empty DB schema."""
-        try:
-            from core.database import delete_database_file, init_db
-
-            deleted = delete_database_file()
-            # Recreate empty DB so app continues to work
-            init_db()
+        self.parent.db.submit(
+            self._recreate_database, on_done=self._on_db_file_deleted,
+            on_error=lambda e: QMessageBox.critical(
+                self, 'Error', f'Gagal menghapus database: {e}'
+            ),
+            label='Menghapus database...'
+        )
 
-            if deleted:
-                # Clear UI similar to reset
-                self.df_results = None
-                self.results_table.clear()
-                self.results_table.setRowCount(0)
-                self.results_table.setColumnCount(0)
+    def _on_db_file_deleted(self, deleted):
+        if deleted:
+            # Clear UI similar to reset
+            self._clear_results()
+            QMessageBox.information(self, 'Sukses', 'File database dihapus dan database kosong dibuat ulang.')
+        else:
+            QMessageBox.information(self, 'Info', 'File database tidak ditemukan atau gagal dihapus.')
 
-                self.stat_count.setText("Jumlah Wisata: 0")
-                self.stat_price.setText("Range Harga: -")
-                self.stat_rating.setText("Range Rating: -")
-                self.stat_best.setText("Rekomendasi Terbaik: -")
+    def _clear_results(self):
+        """Kosongkan tabel, panel statistik dan ringkasan."""
+        self.df_results = None
+        self.parent.latest_results = None
+        self.parent.latest_live = None
+        self.results_model.set_columns([])
 
-                self.summary_text.clear()
-                self.criteria_breakdown.clear()
+        self.stat_count.setText("Jumlah Wisata: 0")
+        self.stat_price.setText("Range Harga: -")
+        self.stat_rating.setText("Range Rating: -")
+        self.stat_best.setText("Rekomendasi Terbaik: -")
 
-                QMessageBox.information(self, 'Sukses', 'File database dihapus dan database kosong dibuat ulang.')
-            else:
-                QMessageBox.information(self, 'Info', 'File database tidak ditemukan atau gagal dihapus.')
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Gagal menghapus database: {e}')
+        self.summary_text.clear()
+        self.criteria_breakdown.clear()
             
     def reset_db(self):
         """Reset database dengan feedback visual"""
-        try:
-            from core.database import reset_wisata_table
-            reset_wisata_table()
-            
-            # Clear semua tampilan
-            self.df_results = None
-            self.results_table.clear()
-            self.results_table.setRowCount(0)
-            self.results_table.setColumnCount(0)
-            
-            # Update stats panel
-            self.stat_count.setText("Jumlah Wisata: 0")
-            self.stat_price.setText("Range Harga: -")
-            self.stat_rating.setText("Range Rating: -")
-            self.stat_best.setText("Rekomendasi Terbaik: -")
-            
-            # Clear summary
-            self.summary_text.clear()
-            self.criteria_breakdown.clear()
-            
-            # Show success message
-            QMessageBox.information(
-                self, 
-                'Sukses', 
-                '✅ Database berhasil direset. Semua data wisata telah dihapus.'
-            )
-        except Exception as e:
-            QMessageBox.critical(
+        from core.database import reset_wisata_table
+        self.parent.db.submit(
+            reset_wisata_table, on_done=self._on_db_reset,
+            on_error=lambda e: QMessageBox.critical(
                 self, 
                 'Error', 
                 f'Gagal mereset database: {str(e)}'
-            )
\ No newline at end of file
+            ),
+            label='Mereset database...'
+        )
+
+    def _on_db_reset(self, _):
+        # Clear semua tampilan
+        self._clear_results()
+        
+        # Show success message
+        QMessageBox.information(
+            self, 
+            'Sukses', 
+            '✅ Database berhasil direset. Semua data wisata telah dihapus.'
+        )
\ No newline at end of file
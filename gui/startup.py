@@ -0,0 +1,198 @@
+"""
+Pencatat waktu startup aplikasi.
+
+Waktu dihitung relatif terhadap saat modul ini pertama kali di-import
+(``app.py`` meng-import-nya paling awal). Dalam mode profiling
+(``python app.py --profile-startup``) waktu import setiap modul juga
+dicatat dan laporan JSON ditulis setelah startup selesai.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+_T0 = time.perf_counter()
+_marks = []
+_phases = []
+_imports = []
+
+# Mark yang menandai startup selesai (laporan profiling ditulis saat lengkap)
+STARTUP_MARKS = ('first_paint', 'event_loop', 'first_page', 'init_db')
+
+DEFAULT_REPORT_PATH = 'startup_profile.json'
+
+_report_path = None
+_report_written = False
+
+
+def elapsed_ms():
+    """Milidetik sejak awal startup."""
+    return (time.perf_counter() - _T0) * 1000
+
+
+def mark(name):
+    """Catat satu titik waktu startup (hanya yang pertama untuk ``name``)."""
+    if all(existing != name for existing, _ in _marks):
+        _marks.append((name, elapsed_ms()))
+        if _report_path and not _report_written:
+            recorded = {existing for existing, _ in _marks}
+            if all(m in recorded for m in STARTUP_MARKS):
+                write_report()
+
+
+@contextmanager
+def phase(name):
+    """Catat durasi satu tahap startup, misal konstruksi halaman atau ``init_db``."""
+    start = elapsed_ms()
+    try:
+        yield
+    finally:
+        _phases.append({
+            'name': name,
+            'start_ms': round(start, 3),
+            'duration_ms': round(elapsed_ms() - start, 3),
+            'thread': threading.current_thread().name,
+        })
+
+
+def format_report():
+    """Ringkasan satu baris, misal ``'first_paint 180 ms, first_page 620 ms'``."""
+    return ', '.join(f'{name} {ms:.0f} ms' for name, ms in _marks)
+
+
+# ==========================================================
+# PROFILING MODE
+# ==========================================================
+class _ImportTimer:
+    """Meta path finder yang mengukur eksekusi setiap modul yang di-import.
+
+    Spec dicari oleh finder lain seperti biasa; hanya ``exec_module`` (dan
+    ``create_module`` untuk extension) dari loader modul tersebut yang
+    dibungkus. Waktu self = kumulatif dikurangi import anak.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        loader = spec.loader
+        if loader is not None and not isinstance(loader, type):
+            try:
+                loader.create_module = self._wrap(name, loader.create_module)
+                loader.exec_module = self._wrap(name, loader.exec_module)
+            except AttributeError:
+                pass
+        return spec
+
+    def _wrap(self, name, fn):
+        def timed(*args, **kwargs):
+            stack = self._stack()
+            entry = [name, elapsed_ms(), 0.0]
+            stack.append(entry)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stack.pop()
+                cumulative = elapsed_ms() - entry[1]
+                if stack:
+                    stack[-1][2] += cumulative
+                _imports.append({
+                    'module': name,
+                    'start_ms': round(entry[1], 3),
+                    'self_ms': round(cumulative - entry[2], 3),
+                    'cumulative_ms': round(cumulative, 3),
+                    'stack': [e[0] for e in stack] + [name],
+                })
+        return timed
+
+
+def enable_profiling(report_path=DEFAULT_REPORT_PATH):
+    """Aktifkan pencatatan waktu import dan tulis laporan ke ``report_path``."""
+    global _report_path
+    _report_path = report_path
+    if not any(isinstance(f, _ImportTimer) for f in sys.meta_path):
+        sys.meta_path.insert(0, _ImportTimer())
+
+
+def profiling_enabled():
+    return _report_path is not None
+
+
+def report():
+    """Laporan profiling startup sebagai dict (siap ditulis ke JSON)."""
+    # Baik create_module maupun exec_module dicatat; gabungkan per modul
+    imports = {}
+    for item in _imports:
+        merged = imports.get(item['module'])
+        if merged is None:
+            imports[item['module']] = dict(item)
+        else:
+            merged['start_ms'] = min(merged['start_ms'], item['start_ms'])
+            merged['self_ms'] = round(merged['self_ms'] + item['self_ms'], 3)
+            merged['cumulative_ms'] = round(merged['cumulative_ms'] + item['cumulative_ms'], 3)
+    ordered = sorted(imports.values(), key=lambda item: item['start_ms'])
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'marks_ms': {name: round(ms, 3) for name, ms in _marks},
+        'phases': list(_phases),
+        'imports': ordered,
+        'slowest_imports': [
+            {'module': item['module'], 'cumulative_ms': item['cumulative_ms']}
+            for item in sorted(ordered, key=lambda i: -i['cumulative_ms'])[:25]
+        ],
+    }
+
+
+def folded_stacks(data=None):
+    """Baris format "collapsed stack" (flamegraph.pl / speedscope), nilai dalam mikrodetik."""
+    data = data or report()
+    lines = [
+        'import;' + ';'.join(item['stack']) + f' {int(item["self_ms"] * 1000)}'
+        for item in data['imports'] if item['self_ms'] > 0
+    ]
+    lines += [
+        f'phase;{item["name"]} {int(item["duration_ms"] * 1000)}'
+        for item in data['phases'] if item['duration_ms'] > 0
+    ]
+    return lines
+
+
+def write_report(path=None):
+    """Tulis laporan JSON dan file ``.folded`` di sebelahnya; return path JSON."""
+    global _report_written
+    path = path or _report_path or DEFAULT_REPORT_PATH
+    data = report()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    with open(os.path.splitext(path)[0] + '.folded', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(folded_stacks(data)) + '\n')
+    _report_written = True
+    return path
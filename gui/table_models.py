@@ -0,0 +1,291 @@
+"""
+Model tabel Qt (model/view) yang membaca langsung dari array kolom.
+
+Sel hanya diformat saat view memintanya (baris yang terlihat), sehingga
+waktu render bergantung pada ukuran viewport, bukan jumlah baris data.
+"""
+
+import numpy as np
+import pandas as pd
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+
+def format_cell(value):
+    """Teks tampilan satu sel; NaN/None ditampilkan kosong."""
+    if value is None:
+        return ''
+    if isinstance(value, (float, np.floating)):
+        return '' if np.isnan(value) else str(float(value))
+    return str(value)
+
+
+class _ColumnarModelBase(QAbstractTableModel):
+    """Read-only table model backed by one NumPy array per column.
+
+    Penyimpanan dan tampilan bersama untuk :class:`ColumnarTableModel`
+    (bisa ditambah baris) dan :class:`SortFilterTableModel`.
+
+    Args:
+        columns: Nama kolom yang ditampilkan (urut sesuai header).
+        headers: Label header opsional; default sama dengan ``columns``.
+    """
+
+    def __init__(self, columns, headers=None, parent=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self.headers = list(headers) if headers is not None else list(self.columns)
+        self._arrays = [np.empty(0, dtype=object) for _ in self.columns]
+        self._rows = 0
+
+    @staticmethod
+    def _column_arrays(df, columns):
+        return [
+            df[col].to_numpy() if col in df.columns else np.full(len(df), None, dtype=object)
+            for col in columns
+        ]
+
+    def set_columns(self, columns, headers=None):
+        """Ganti daftar kolom (model dikosongkan; isi lagi dengan :meth:`set_frame`)."""
+        self.columns = list(columns)
+        self.headers = list(headers) if headers is not None else list(self.columns)
+        self.set_frame(pd.DataFrame(columns=self.columns))
+
+    def set_frame(self, df):
+        """Ganti seluruh isi model dengan kolom dari ``df`` (tanpa menyalin per sel)."""
+        self.beginResetModel()
+        self._arrays = self._column_arrays(df, self.columns)
+        self._rows = len(df)
+        self.endResetModel()
+
+    def clear(self):
+        self.set_frame(pd.DataFrame(columns=self.columns))
+
+    def value(self, row, column):
+        """Nilai mentah pada (baris, kolom) model."""
+        return self._arrays[column][row]
+
+    # ----------------------------------------------------------
+    # QAbstractTableModel
+    # ----------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return format_cell(self.value(index.row(), index.column()))
+        if role == Qt.TextAlignmentRole:
+            if self._arrays[index.column()].dtype.kind in 'iuf':
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+
+class ColumnarTableModel(_ColumnarModelBase):
+    """Columnar model dengan urutan baris sumber; baris bisa ditambah di akhir."""
+
+    def append_frame(self, df):
+        """Tambahkan baris di akhir tanpa me-reset view (posisi scroll tetap)."""
+        if not len(df):
+            return
+        first = self._rows
+        self.beginInsertRows(QModelIndex(), first, first + len(df) - 1)
+        self._arrays = [
+            np.concatenate([old, new])
+            for old, new in zip(self._arrays, self._column_arrays(df, self.columns))
+        ]
+        self._rows += len(df)
+        self.endInsertRows()
+
+
+class SortFilterTableModel(_ColumnarModelBase):
+    """Columnar model with sorting and filtering done on index arrays.
+
+    Data asli tidak pernah disalin: view memakai array ``_view`` berisi
+    nomor baris sumber. Urutan argsort per kolom di-cache sampai data
+    diganti, filter berupa boolean mask, dan keduanya hanya memicu
+    ``layoutChanged``.
+    """
+
+    def __init__(self, columns, headers=None, parent=None):
+        super().__init__(columns, headers, parent)
+        self._view = np.arange(0)
+        self._sort = None
+        self._order = None
+        self._mask = None
+        self._sort_cache = {}
+        self._names_lower = np.empty(0, dtype=str)
+        self._search_text = ''
+        self._search_rows = None
+
+    def _load(self, df):
+        self._arrays = self._column_arrays(df, self.columns)
+        self._rows = len(df)
+        self._sort_cache = {}
+        # Nama lowercase dihitung sekali per data untuk pencarian
+        names = df['name'] if 'name' in df.columns else pd.Series('', index=df.index)
+        self._names_lower = names.fillna('').astype(str).str.lower().to_numpy().astype(str)
+        self._search_text = ''
+        self._search_rows = None
+
+    def set_frame(self, df):
+        self.beginResetModel()
+        self._load(df)
+        self._sort = None
+        self._order = None
+        self._mask = None
+        self._view = np.arange(self._rows)
+        self.endResetModel()
+
+    def update_frame(self, df):
+        """Ganti isi dengan ``df`` berukuran sama, repaint hanya baris yang berubah.
+
+        Urutan sort yang aktif dihitung ulang; jika urutan tampilan ikut
+        berubah, model memicu ``layoutChanged``. Ukuran atau kolom yang
+        berbeda diperlakukan seperti :meth:`set_frame`.
+        """
+        if len(df) != self._rows or any(c not in df.columns for c in self.columns):
+            self.set_frame(df)
+            return
+
+        old_arrays = self._arrays
+        self._load(df)
+        changed = np.zeros(self._rows, dtype=bool)
+        for old, new in zip(old_arrays, self._arrays):
+            changed |= np.asarray(old != new, dtype=bool)
+
+        view = self._current_view()
+        if not np.array_equal(view, self._view):
+            self.layoutAboutToBeChanged.emit()
+            self._view = view
+            self.layoutChanged.emit()
+            return
+
+        # Kirim dataChanged per rentang baris berurutan yang berubah
+        positions = np.flatnonzero(changed[self._view])
+        last_column = len(self.columns) - 1
+        for run in np.split(positions, np.flatnonzero(np.diff(positions) > 1) + 1):
+            if len(run):
+                self.dataChanged.emit(
+                    self.index(int(run[0]), 0), self.index(int(run[-1]), last_column)
+                )
+
+    def source_rows(self):
+        """Nomor baris sumber yang terlihat, sesuai urutan tampilan."""
+        return self._view
+
+    def value(self, row, column):
+        return self._arrays[column][self._view[row]]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._view)
+
+    def _column_order(self, column):
+        order = self._sort_cache.get(column)
+        if order is None:
+            values = self._arrays[column]
+            if values.dtype == object:
+                values = pd.Series(values).fillna('').astype(str).str.lower().to_numpy()
+            order = np.argsort(values, kind='stable')
+            self._sort_cache[column] = order
+        return order
+
+    def _current_view(self):
+        if self._sort is not None:
+            column, order = self._sort
+            ascending = self._column_order(column)
+            self._order = ascending if order == Qt.AscendingOrder else ascending[::-1]
+        order = self._order if self._order is not None else np.arange(self._rows)
+        return order if self._mask is None else order[self._mask[order]]
+
+    def _apply(self):
+        self.layoutAboutToBeChanged.emit()
+        self._view = self._current_view()
+        self.layoutChanged.emit()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if not 0 <= column < len(self.columns):
+            return
+        self._sort = (column, order)
+        self._apply()
+
+    def set_filter(self, mask):
+        """Tampilkan hanya baris sumber dengan ``mask`` True (``None`` = semua)."""
+        self._mask = None if mask is None else np.asarray(mask, dtype=bool)
+        self._apply()
+
+    def search_mask(self, text):
+        """Boolean mask baris yang namanya mengandung ``text`` (case-insensitive).
+
+        Saat user mengetik lanjutan dari teks sebelumnya, pencarian hanya
+        dilakukan pada baris yang cocok sebelumnya.
+        """
+        text = text.lower()
+        mask = np.zeros(self._rows, dtype=bool)
+        if not text:
+            self._search_text, self._search_rows = '', None
+            mask[:] = True
+            return mask
+
+        if self._search_rows is not None and text.startswith(self._search_text):
+            candidates = self._search_rows
+        else:
+            candidates = np.arange(self._rows)
+        found = np.char.find(self._names_lower[candidates], text) >= 0
+        self._search_text, self._search_rows = text, candidates[found]
+        mask[self._search_rows] = True
+        return mask
+
+
+def _number(fmt):
+    def format_value(value):
+        if value is None or (isinstance(value, (float, np.floating)) and np.isnan(value)):
+            return ''
+        return fmt.format(value)
+    return format_value
+
+
+# Warna latar kolom rank: (batas rank, warna)
+RANK_COLORS = [
+    (1, QColor(255, 255, 204)),   # Kuning muda
+    (3, QColor(204, 255, 204)),   # Hijau muda
+    (10, QColor(224, 224, 255)),  # Biru muda
+]
+
+
+class ResultsTableModel(SortFilterTableModel):
+    """Model tabel hasil ranking dengan format angka dan warna rank."""
+
+    FORMATTERS = {
+        'price': _number('Rp{:,}'),
+        'rating_count': _number('{:,}'),
+        'rating': _number('{:.2f}'),
+        'distance_km': _number('{:.2f} km'),
+        'topsis_score': _number('{:.4f}'),
+    }
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            formatter = self.FORMATTERS.get(column, format_cell)
+            return formatter(self.value(index.row(), index.column()))
+        if role == Qt.BackgroundRole and column == 'rank':
+            rank = self.value(index.row(), index.column())
+            for limit, color in RANK_COLORS:
+                if rank <= limit:
+                    return QBrush(color)
+            return None
+        return super().data(index, role)
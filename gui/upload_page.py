@@ -1,14 +1,20 @@
 """
-Upload page untuk upload data wisata dari CSV atau Excel.
+Upload page untuk upload data wisata dari CSV, Excel, Parquet, Arrow atau JSON Lines.
 """
 
+import os
+
 import pandas as pd
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog,
-    QMessageBox, QTableWidget, QTableWidgetItem, QHeaderView, QLabel
+    QMessageBox, QTableView, QHeaderView, QLabel, QProgressBar,
+    QCheckBox
 )
 
-from core.database import save_wisata_rows, load_wisata_db
+from core.database import fetch_wisata_page, count_wisata, export_wisata_csv, PAGE_SIZE
+from core.ingest import check_columns, clean_chunk, read_file_chunks
+from gui.table_models import ColumnarTableModel
+from gui.workers import IngestWorker
 from utils.template_generator import generate_excel_template
 
 
@@ -16,6 +22,23 @@ from utils.template_generator import generate_excel_template
 REQUIRED_COLS = [
     'name', 'price', 'rating', 'rating_count', 'latitude', 'longitude'
 ]
+NUMERIC_COLS = REQUIRED_COLS[1:]
+
+
+# Filter dialog file untuk semua format yang didukung core.ingest
+DATA_FILE_FILTER = (
+    'Data Files (*.csv *.xls *.xlsx *.parquet *.pq *.arrow *.feather *.ipc *.jsonl *.ndjson);;'
+    'CSV Files (*.csv);;Excel Files (*.xls *.xlsx);;Parquet Files (*.parquet *.pq);;'
+    'Arrow/Feather Files (*.arrow *.feather *.ipc);;JSON Lines (*.jsonl *.ndjson)'
+)
+
+
+def _read_file(path):
+    """Baca file secara streaming (hanya kolom wajib) menjadi satu DataFrame."""
+    chunks = list(read_file_chunks(path))
+    if not chunks:
+        return pd.DataFrame(columns=REQUIRED_COLS)
+    return pd.concat(chunks, ignore_index=True)
 
 
 class UploadPage(QWidget):
@@ -23,7 +46,14 @@ class UploadPage(QWidget):
         super().__init__(parent)
         self.parent = parent
         self.df_data = pd.DataFrame(columns=REQUIRED_COLS)
+        # Cursor keyset (id terakhir) untuk halaman berikutnya dari DB
+        self._db_last_id = None
+        self._has_more = False
+        self._ingest_worker = None
         self._build()
+        # Tombol DB aktif setelah init_db selesai (jika tidak ada tugas DB lain)
+        self._set_db_buttons_enabled(self.parent.db_ready)
+        self.parent.when_db_ready(lambda: self._set_db_buttons_enabled(not self.parent.db.busy))
 
     # ==========================================================
     # UI BUILDER
@@ -39,23 +69,70 @@ class UploadPage(QWidget):
         btn_load_excel = QPushButton('Upload Excel')
         btn_load_excel.clicked.connect(self.load_excel)
 
-        btn_save_db = QPushButton('Simpan ke DB')
-        btn_save_db.clicked.connect(self.save_to_db)
+        btn_load_other = QPushButton('Upload Parquet/Arrow/JSONL')
+        btn_load_other.clicked.connect(self.load_other)
+
+        self.btn_import_file = QPushButton('Import File ke DB')
+        self.btn_import_file.setToolTip(
+            'Baca file besar (CSV, Excel, Parquet, Arrow, JSONL) per bagian '
+            'langsung ke database tanpa memuat ke tabel'
+        )
+        self.btn_import_file.clicked.connect(self.import_file_to_db)
+
+        self.btn_import_dir = QPushButton('Import Folder')
+        self.btn_import_dir.setToolTip(
+            'Import semua file data dalam satu folder (diproses paralel)'
+        )
+        self.btn_import_dir.clicked.connect(self.import_folder_to_db)
 
-        btn_refresh = QPushButton('Muat dari DB')
-        btn_refresh.clicked.connect(self.refresh_from_db)
+        self.btn_save_db = QPushButton('Simpan ke DB')
+        self.btn_save_db.clicked.connect(self.save_to_db)
+
+        self.btn_refresh = QPushButton('Muat dari DB')
+        self.btn_refresh.clicked.connect(self.refresh_from_db)
+
+        self.btn_more = QPushButton('Muat Berikutnya')
+        self.btn_more.setEnabled(False)
+        self.btn_more.clicked.connect(self.load_more_from_db)
+
+        self.btn_export = QPushButton('Export DB ke CSV')
+        self.btn_export.clicked.connect(self.export_db_csv)
 
         h.addWidget(btn_load_csv)
         h.addWidget(btn_load_excel)
-        h.addWidget(btn_save_db)
-        h.addWidget(btn_refresh)
+        h.addWidget(btn_load_other)
+        h.addWidget(self.btn_import_file)
+        h.addWidget(self.btn_import_dir)
+        h.addWidget(self.btn_save_db)
+        h.addWidget(self.btn_refresh)
+        h.addWidget(self.btn_more)
+        h.addWidget(self.btn_export)
         layout.addLayout(h)
 
-        # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(len(REQUIRED_COLS))
-        self.table.setHorizontalHeaderLabels(REQUIRED_COLS)
+        self.chk_delta = QCheckBox(
+            'Import delta: hanya simpan perubahan dan hapus data yang tidak ada di file/folder'
+        )
+        layout.addWidget(self.chk_delta)
+
+        # Progres ingest (disembunyikan saat tidak ada ingest)
+        self.ingest_bar = QProgressBar()
+        self.ingest_label = QLabel()
+        self.btn_cancel_ingest = QPushButton('Batal')
+        self.btn_cancel_ingest.clicked.connect(self.cancel_ingest)
+        progress_row = QHBoxLayout()
+        progress_row.addWidget(self.ingest_bar, stretch=1)
+        progress_row.addWidget(self.ingest_label)
+        progress_row.addWidget(self.btn_cancel_ingest)
+        layout.addLayout(progress_row)
+        self._show_ingest_progress(False)
+
+        # Table (model/view: sel diformat hanya untuk baris yang terlihat)
+        self.table_model = ColumnarTableModel(REQUIRED_COLS, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Tinggi baris tetap agar view tidak mengukur isi setiap baris
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         layout.addWidget(self.table)
 
         note = QLabel(
@@ -75,13 +152,7 @@ class UploadPage(QWidget):
         if not path:
             return
 
-        try:
-            df = pd.read_csv(path)
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Gagal membaca CSV:\n{e}')
-            return
-
-        self._ingest_df(df)
+        self._load_file(pd.read_csv, path, 'Gagal membaca CSV')
 
     def load_excel(self):
         path, _ = QFileDialog.getOpenFileName(
@@ -90,90 +161,272 @@ class UploadPage(QWidget):
         if not path:
             return
 
-        try:
-            df = pd.read_excel(path)
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Gagal membaca Excel:\n{e}')
+        self._load_file(_read_file, path, 'Gagal membaca Excel')
+
+    def load_other(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, 'Open Parquet/Arrow/JSONL',
+            filter='Parquet Files (*.parquet *.pq);;Arrow/Feather Files (*.arrow *.feather *.ipc);;'
+                   'JSON Lines (*.jsonl *.ndjson)'
+        )
+        if not path:
             return
 
-        self._ingest_df(df)
+        self._load_file(_read_file, path, 'Gagal membaca file')
 
     # ==========================================================
     # INGEST & VALIDATION
     # ==========================================================
+    def _load_file(self, reader, path, error_text):
+        """Baca dan validasi file di thread database, lalu tampilkan ke tabel."""
+        def read():
+            df = reader(path)
+            check_columns(df)
+            # Konversi tipe sekali saat ingest; tabel wisata bertipe STRICT
+            # sehingga baris kosong/bukan angka tidak bisa disimpan.
+            return clean_chunk(df)
+
+        self._run_db(
+            read, on_done=self._show_loaded, error_text=error_text,
+            label='Membaca file...'
+        )
+
     def _ingest_df(self, df):
         """Validasi kolom dan tampilkan ke tabel."""
-        missing = set(REQUIRED_COLS) - set(df.columns)
-        if missing:
-            QMessageBox.critical(
-                self, 'Error',
-                f'Kolom wajib yang hilang: {", ".join(missing)}'
-            )
+        try:
+            check_columns(df)
+        except ValueError as e:
+            QMessageBox.critical(self, 'Error', str(e))
             return
+        self._show_loaded(clean_chunk(df))
+
+    def _show_loaded(self, result):
+        df, report = result
+        self.df_data = df.reset_index(drop=True)
+        self._db_last_id = None
+        self._has_more = False
+        self.btn_more.setEnabled(False)
+        self._refresh_table_from_df()
 
-        # Ambil hanya kolom yang dibutuhkan
-        df = df[REQUIRED_COLS].copy()
+        message = f'Data berhasil dimuat: {len(self.df_data)} baris'
+        if len(report):
+            message += f'\n{len(report)} baris dilewati:\n{report.describe()}'
+        QMessageBox.information(self, 'Sukses', message)
 
-        # Penanganan NaN
-        df = df.fillna('')
+    # ==========================================================
+    # BACKGROUND INGEST
+    # ==========================================================
+    def _show_ingest_progress(self, visible):
+        for widget in (self.ingest_bar, self.ingest_label, self.btn_cancel_ingest):
+            widget.setVisible(visible)
+
+    def _start_ingest(self, source, total=None, delta=False):
+        """Jalankan IngestWorker untuk file/folder (path) atau DataFrame."""
+        worker = IngestWorker(source, delta=delta, parent=self)
+        worker.progress.connect(self._on_ingest_progress)
+        worker.completed.connect(self._on_ingest_completed)
+        self._ingest_worker = worker
+
+        # Jumlah baris file belum diketahui; bar berjalan tanpa persentase
+        self.ingest_bar.setRange(0, total or 0)
+        self.ingest_bar.setValue(0)
+        self.ingest_label.setText('Memulai import...')
+        self.btn_cancel_ingest.setEnabled(True)
+        self._show_ingest_progress(True)
+        self._set_db_buttons_enabled(False)
+        self.parent.set_ingest_running(True)
+        worker.start()
+
+    def _on_ingest_progress(self, rows_read, rows_written, rejected):
+        if self.ingest_bar.maximum():
+            self.ingest_bar.setValue(rows_read)
+        self.ingest_label.setText(
+            f'{rows_read:,} dibaca, {rows_written:,} disimpan, {rejected:,} ditolak'
+        )
 
-        self.df_data = df
-        self._refresh_table_from_df()
+    def cancel_ingest(self):
+        if self._ingest_worker is not None:
+            self.btn_cancel_ingest.setEnabled(False)
+            self.ingest_label.setText('Membatalkan...')
+            self._ingest_worker.cancel()
+
+    def stop_ingest(self):
+        """Batalkan ingest yang berjalan dan tunggu thread-nya selesai."""
+        if self._ingest_worker is not None:
+            self._ingest_worker.cancel()
+            self._ingest_worker.wait()
+
+    def _on_ingest_completed(self, summary):
+        self._ingest_worker.wait()
+        self._ingest_worker.deleteLater()
+        self._ingest_worker = None
+        self._show_ingest_progress(False)
+        self._set_db_buttons_enabled(True)
+        self.parent.set_ingest_running(False)
+
+        status = summary['status']
+        if status == 'cancelled':
+            QMessageBox.information(
+                self, 'Dibatalkan', 'Import dibatalkan. Tidak ada data yang disimpan.'
+            )
+            return
+        if status == 'error':
+            QMessageBox.critical(self, 'Error', f'Gagal import data:\n{summary["error"]}')
+            return
 
-        QMessageBox.information(
-            self, 'Sukses',
-            f'Data berhasil dimuat: {len(self.df_data)} baris'
+        message = (
+            f'{summary["rows_read"]} baris diproses:\n'
+            f'{summary["inserted"]} baru, {summary["updated"]} diperbarui, '
+            f'{summary["unchanged"]} tidak berubah, {summary["rejected"]} ditolak.'
         )
+        if 'deleted' in summary:
+            message += f'\n{summary["deleted"]} baris dihapus (tidak ada di data baru).'
+        if summary['rejected'] and 'reject_report' in summary:
+            message += f'\n\n{summary["reject_report"].describe()}'
+        for info in summary.get('files', []):
+            name = os.path.basename(info['path'])
+            if 'error' in info:
+                message += f'\n{name}: gagal dibaca ({info["error"]})'
+            else:
+                message += f'\n{name}: {info["rows_read"]} baris, {info["rejected"]} ditolak'
+        QMessageBox.information(self, 'Sukses', message)
 
     # ==========================================================
     # RENDER TABLE
     # ==========================================================
     def _refresh_table_from_df(self):
-        self.table.setRowCount(len(self.df_data))
-
-        for i, (_, row) in enumerate(self.df_data.iterrows()):
-            for j, col in enumerate(REQUIRED_COLS):
-                self.table.setItem(i, j, QTableWidgetItem(str(row[col])))
+        self.table_model.set_frame(self.df_data)
 
     # ==========================================================
     # DATABASE OPERATIONS
     # ==========================================================
+    def _set_db_buttons_enabled(self, enabled):
+        """Cegah operasi DB ganda selama tugas sebelumnya masih berjalan."""
+        enabled = enabled and self._ingest_worker is None and self.parent.db_ready
+        for btn in (self.btn_import_file, self.btn_import_dir, self.btn_save_db,
+                    self.btn_refresh, self.btn_export):
+            btn.setEnabled(enabled)
+        self.btn_more.setEnabled(enabled and self._has_more)
+
+    def _run_db(self, fn, *args, on_done, error_text, label, **kwargs):
+        """Jalankan ``fn`` di thread database lalu panggil ``on_done`` di GUI."""
+        self._set_db_buttons_enabled(False)
+
+        def done(result):
+            self._set_db_buttons_enabled(True)
+            on_done(result)
+
+        def failed(e):
+            self._set_db_buttons_enabled(True)
+            QMessageBox.critical(self, 'Error', f'{error_text}:\n{e}')
+
+        self.parent.db.submit(
+            fn, *args, on_done=done, on_error=failed, label=label, **kwargs
+        )
+
+    def import_file_to_db(self):
+        """Import file data langsung ke database per chunk (memori konstan)."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, 'Import File ke DB', filter=DATA_FILE_FILTER
+        )
+        if not path:
+            return
+
+        self._start_ingest(path, delta=self._confirm_delta())
+
+    def _confirm_delta(self):
+        """Mode delta menghapus data lama; minta konfirmasi dulu."""
+        if not self.chk_delta.isChecked():
+            return False
+        reply = QMessageBox.question(
+            self, 'Konfirmasi Import Delta',
+            'Data wisata yang tidak ada di file/folder ini akan dihapus dari database. Lanjutkan?',
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
+
+    def import_folder_to_db(self):
+        """Import semua file data dalam satu folder sekaligus."""
+        directory = QFileDialog.getExistingDirectory(self, 'Pilih Folder Data Wisata')
+        if not directory:
+            return
+
+        self._start_ingest(directory, delta=self._confirm_delta())
+
     def save_to_db(self):
         if self.df_data.empty:
             QMessageBox.warning(self, 'Warning', 'Tidak ada data untuk disimpan.')
             return
 
-        try:
-            rows = self.df_data.to_dict('records')
-            save_wisata_rows(rows)
-            QMessageBox.information(
-                self, 'Sukses',
-                f'{len(rows)} data wisata berhasil disimpan ke database.'
-            )
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Gagal menyimpan ke DB:\n{e}')
+        self._start_ingest(self.df_data, total=len(self.df_data))
 
     def refresh_from_db(self):
-        """Load data dari database (manual)."""
-        try:
-            df = load_wisata_db()
-
-            if df.empty:
+        """Load halaman pertama data dari database (manual)."""
+        def fetch():
+            df, last_id = fetch_wisata_page(0, PAGE_SIZE, REQUIRED_COLS)
+            return df, last_id, count_wisata()
+
+        def show(result):
+            df, last_id, total = result
+            if last_id is None:
                 QMessageBox.information(self, 'Info', 'Database kosong.')
                 return
 
-            df = df[REQUIRED_COLS].copy()
-            df = df.fillna('')
-
             self.df_data = df
+            self._db_last_id = last_id
+            self._has_more = len(self.df_data) < total
+            self.btn_more.setEnabled(self._has_more)
             self._refresh_table_from_df()
 
             QMessageBox.information(
                 self, 'Sukses',
-                f'Data dimuat dari DB: {len(self.df_data)} baris'
+                f'Data dimuat dari DB: {len(self.df_data)} dari {total} baris'
             )
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Gagal membaca DB:\n{e}')
+
+        self._run_db(
+            fetch, on_done=show, error_text='Gagal membaca DB',
+            label='Memuat data dari DB...'
+        )
+
+    def load_more_from_db(self):
+        """Tambahkan halaman berikutnya dari database ke tabel."""
+        if self._db_last_id is None:
+            return
+
+        def show(result):
+            df, last_id = result
+            if last_id is None:
+                self._has_more = False
+                self.btn_more.setEnabled(False)
+                return
+
+            self.df_data = pd.concat([self.df_data, df], ignore_index=True)
+            self._db_last_id = last_id
+            self._has_more = len(df) == PAGE_SIZE
+            self.btn_more.setEnabled(self._has_more)
+            self.table_model.append_frame(df)
+
+        self._run_db(
+            fetch_wisata_page, self._db_last_id, PAGE_SIZE, REQUIRED_COLS,
+            on_done=show, error_text='Gagal membaca DB',
+            label='Memuat halaman berikutnya...'
+        )
+
+    def export_db_csv(self):
+        """Export seluruh isi tabel wisata ke CSV secara bertahap."""
+        path, _ = QFileDialog.getSaveFileName(
+            self, 'Export DB ke CSV', 'wisata_export.csv', 'CSV Files (*.csv)'
+        )
+        if not path:
+            return
+
+        self._run_db(
+            export_wisata_csv, path, REQUIRED_COLS,
+            on_done=lambda written: QMessageBox.information(
+                self, 'Sukses', f'{written} baris diexport ke:\n{path}'
+            ),
+            error_text='Gagal export DB', label='Export DB ke CSV...'
+        )
 
     # ==========================================================
     # EXTRA — DIPANGGIL DARI TOPBAR
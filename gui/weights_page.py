@@ -6,12 +6,16 @@ import numpy as np
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QSpinBox, QPushButton, QMessageBox, 
     QGridLayout, QGroupBox, QHBoxLayout, QComboBox, QSlider, QFormLayout,
-    QFrame
+    QFrame, QCheckBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette, QColor
 
 
+# Jeda setelah perubahan bobot terakhir sebelum ranking live dihitung
+LIVE_DEBOUNCE_MS = 30
+
+
 class CriteriaControl(QWidget):
     """Widget kontrol untuk satu kriteria dengan slider dan spinbox"""
     valueChanged = pyqtSignal(int)
@@ -161,6 +165,10 @@ class WeightsPage(QWidget):
         self.parent = parent
         self.criteria_controls = {}
         self._build()
+        self.parent.require_db(self.chk_live)
+        # Profil dimuat bersama init_db; tombol proses baru aktif setelah
+        # dbReady sehingga bobot selalu sudah dipulihkan sebelum dibaca
+        self.parent.when_db_ready(self.load_saved_weights)
         
     def _build(self):
         main_layout = QVBoxLayout()
@@ -327,6 +335,23 @@ class WeightsPage(QWidget):
         
         manual_group.setLayout(manual_layout)
         main_layout.addWidget(manual_group)
+
+        # Mode live: ranking dihitung ulang (debounce) setiap bobot berubah
+        live_layout = QHBoxLayout()
+        self.chk_live = QCheckBox("⚡ Mode live: perbarui ranking saat bobot diubah")
+        self.chk_live.toggled.connect(self._on_live_toggled)
+        self.lbl_live = QLabel("")
+        self.lbl_live.setStyleSheet("color: #7f8c8d; font-size: 10pt;")
+        live_layout.addWidget(self.chk_live)
+        live_layout.addWidget(self.lbl_live, 1)
+        main_layout.addLayout(live_layout)
+
+        self._live_timer = QTimer(self)
+        self._live_timer.setSingleShot(True)
+        self._live_timer.setInterval(LIVE_DEBOUNCE_MS)
+        self._live_timer.timeout.connect(self._run_live)
+        for control in (price_control, rating_control, count_control, distance_control):
+            control.valueChanged.connect(self._schedule_live)
         
         # Simpan kontrol untuk referensi
         self.price_control = price_control
@@ -501,6 +526,50 @@ class WeightsPage(QWidget):
         
         self.update_total()
         
+    def load_saved_weights(self):
+        """Pulihkan bobot terakhir dari profil user (``MainWindow.saved_profile``)."""
+        profile = self.parent.saved_profile
+        weights = profile and profile.get('weights')
+        if not weights or len(weights) != 4:
+            return
+        self.apply_preset(dict(zip(
+            ["Harga", "Rating", "Jumlah Ulasan", "Jarak"], (int(round(w)) for w in weights)
+        )))
+
+    def current_weights(self):
+        """Bobot mentah [harga, rating, jumlah ulasan, jarak] dari kontrol."""
+        return [
+            self.spin_price.value(),
+            self.spin_rating.value(),
+            self.spin_count.value(),
+            self.spin_dist.value()
+        ]
+
+    def _on_live_toggled(self, checked):
+        if checked:
+            self._schedule_live()
+        else:
+            self._live_timer.stop()
+            self.lbl_live.clear()
+
+    def _schedule_live(self, *_):
+        """Mulai ulang timer debounce; beberapa perubahan beruntun jadi satu ranking."""
+        if self.chk_live.isChecked():
+            self._live_timer.start()
+
+    def _run_live(self):
+        process_page = getattr(self.parent, 'process_page', None)
+        if process_page is not None:
+            process_page.run_live(self.current_weights())
+
+    def set_live_status(self, text, top_names=None):
+        """Tampilkan status ranking live (dan nama teratas) di bawah kontrol bobot."""
+        if not self.chk_live.isChecked():
+            return
+        if top_names:
+            text += ' — ' + ', '.join(str(name) for name in top_names)
+        self.lbl_live.setText(text)
+
     def update_total(self):
         """Update tampilan total bobot"""
         total = (
@@ -0,0 +1,261 @@
+"""
+Worker thread untuk akses database tanpa memblokir event loop Qt.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+
+from core.database import DB_FILE, close_connections, get_catalog, load_user_location
+from core.ingest import IngestCancelled, ingest_directory, ingest_file, ingest_frame
+from core.ranking import (
+    CATALOG_COLUMNS, RankingCancelled, prepare_ranking, rank_catalog
+)
+
+
+class AsyncDatabase(QObject):
+    """Jalankan fungsi database di satu thread worker khusus.
+
+    Semua tugas dieksekusi berurutan di thread yang sama, sehingga worker
+    memakai satu koneksi SQLite miliknya sendiri (lihat
+    ``core.database.get_connection``). Callback ``on_done``/``on_error``
+    selalu dipanggil di thread GUI.
+    """
+
+    # (callback, argumen) dikirim dari thread worker ke thread GUI
+    _deliver = pyqtSignal(object, object)
+
+    # True saat ada tugas yang berjalan, beserta label tugas terakhir
+    busyChanged = pyqtSignal(bool, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-worker')
+        self._pending = 0
+        self._deliver.connect(self._on_deliver)
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def submit(self, fn, *args, on_done=None, on_error=None, label='', **kwargs):
+        """Antrikan ``fn(*args, **kwargs)`` ke thread worker.
+
+        Args:
+            fn: Fungsi yang dijalankan di thread worker (jangan sentuh widget).
+            on_done: Dipanggil di thread GUI dengan hasil ``fn``.
+            on_error: Dipanggil di thread GUI dengan exception dari ``fn``.
+            label: Teks singkat untuk indikator proses.
+
+        Returns:
+            :class:`concurrent.futures.Future` dari tugas tersebut.
+        """
+        self._pending += 1
+        self.busyChanged.emit(True, label)
+
+        def task():
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._deliver.emit(on_error, e)
+                raise
+            self._deliver.emit(on_done, result)
+            return result
+
+        return self._executor.submit(task)
+
+    @pyqtSlot(object, object)
+    def _on_deliver(self, callback, value):
+        self._pending -= 1
+        if self._pending == 0:
+            self.busyChanged.emit(False, '')
+        if callback is not None:
+            callback(value)
+
+    def shutdown(self, wait=True):
+        """Tunggu tugas yang sudah diantrikan lalu hentikan thread worker."""
+        self._executor.shutdown(wait=wait)
+
+
+class IngestWorker(QThread):
+    """Parse, validasi dan simpan file, folder atau DataFrame di thread terpisah.
+
+    Seluruh ingest berjalan dalam satu transaksi; :meth:`cancel` menghentikan
+    proses di antara chunk dan me-rollback semua baris dari ingest ini.
+    """
+
+    # rows_read, rows_written, rejected
+    progress = pyqtSignal(int, int, int)
+
+    # Ringkasan akhir: statistik ingest + 'status' ('done', 'cancelled', 'error')
+    completed = pyqtSignal(dict)
+
+    def __init__(self, source, db_path=DB_FILE, delta=False, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.db_path = db_path
+        # Import delta: hanya tulis perubahan dan hapus baris yang hilang
+        self.delta = delta
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Minta pembatalan; sinyal ``completed`` tetap dikirim."""
+        self._cancel.set()
+
+    def run(self):
+        if isinstance(self.source, pd.DataFrame):
+            ingest = ingest_frame
+        elif os.path.isdir(self.source):
+            ingest = ingest_directory
+        else:
+            ingest = ingest_file
+        summary = {'status': 'done'}
+        try:
+            summary.update(ingest(
+                self.source, self.db_path,
+                progress=self.progress.emit, cancelled=self._cancel.is_set,
+                delta=self.delta
+            ))
+        except IngestCancelled:
+            summary['status'] = 'cancelled'
+        except Exception as e:
+            summary.update(status='error', error=str(e))
+        finally:
+            # Koneksi milik thread ini tidak dipakai lagi setelah thread selesai
+            close_connections(self.db_path)
+        self.completed.emit(summary)
+
+
+# Tahap pipeline ranking: (kunci, label progres)
+RANKING_STAGES = [
+    ('catalog', 'Memuat data wisata'),
+    ('location', 'Memuat lokasi user'),
+    ('distance', 'Menghitung jarak'),
+    ('cache', 'Mencari cache ranking'),
+    ('topsis', 'Menghitung TOPSIS'),
+    ('save', 'Menyimpan cache ranking'),
+    ('table', 'Menyiapkan tabel hasil'),
+]
+
+# Tahap mode live (tanpa simpan cache; matriks keputusan dipakai ulang)
+LIVE_RANKING_STAGES = [
+    ('catalog', 'Memuat data wisata'),
+    ('location', 'Memuat lokasi user'),
+    ('prepare', 'Menyiapkan matriks keputusan'),
+    ('topsis', 'Menghitung TOPSIS'),
+]
+
+# Jumlah baris teratas yang dikirim ke halaman hasil pada mode live
+LIVE_TOP_K = 100
+
+
+class RankingWorker(QThread):
+    """Jalankan pipeline ranking (catalog, jarak, TOPSIS) di thread terpisah.
+
+    Setiap permintaan membawa nomor ``generation``; halaman hanya memakai
+    hasil dari generation terbaru dan membatalkan worker yang lama.
+    Pembatalan diperiksa di antara tahap.
+
+    Dengan ``live=True`` worker memakai :func:`core.ranking.prepare_ranking`
+    (matriks keputusan di-cache) dan hanya mengembalikan ``top_k`` baris
+    teratas, tanpa menyimpan cache ranking.
+
+    Worker tidak pernah menunggu penulis lain (ingest): bobot profil disimpan
+    halaman lewat :class:`AsyncDatabase`, dan cache ranking bersifat
+    best-effort.
+    """
+
+    # generation, label tahap, nomor tahap (1..total), total tahap
+    progress = pyqtSignal(int, str, int, int)
+
+    # Ringkasan akhir: 'generation', 'status' ('done', 'empty', 'no_location',
+    # 'cancelled', 'error'), 'catalog', 'result' (RankingResult) dan 'results'
+    # (DataFrame tampilan, urut rank)
+    completed = pyqtSignal(dict)
+
+    def __init__(self, weights, generation=0, db_path=DB_FILE, live=False,
+                 top_k=LIVE_TOP_K, parent=None):
+        super().__init__(parent)
+        self.weights = list(weights)
+        self.generation = generation
+        self.db_path = db_path
+        self.live = live
+        self.top_k = top_k
+        self._cancel = threading.Event()
+        stages = LIVE_RANKING_STAGES if live else RANKING_STAGES
+        self._steps = {key: i + 1 for i, (key, _) in enumerate(stages)}
+        self._labels = dict(stages)
+
+    def cancel(self):
+        """Minta pembatalan; sinyal ``completed`` tetap dikirim."""
+        self._cancel.set()
+
+    def _stage(self, key):
+        if self._cancel.is_set():
+            raise RankingCancelled()
+        self.progress.emit(
+            self.generation, self._labels[key], self._steps[key], len(self._steps)
+        )
+
+    def _compute_live(self):
+        self._stage('catalog')
+        catalog = get_catalog(CATALOG_COLUMNS, self.db_path)
+        if catalog.empty:
+            return {'status': 'empty'}
+
+        self._stage('location')
+        lat, lon, _ = load_user_location(self.db_path)
+        if lat is None:
+            return {'status': 'no_location'}
+
+        self._stage('prepare')
+        prepared = prepare_ranking(catalog, lat, lon, db_path=self.db_path)
+
+        self._stage('topsis')
+        rows, scores, ranks = prepared.top_k(self.weights, self.top_k)
+        df = catalog.take(rows).to_dataframe()
+        df['distance_km'] = prepared.distance[rows]
+        df['topsis_score'] = scores
+        df['rank'] = ranks
+        return {'status': 'done', 'catalog': catalog, 'results': df, 'live': True}
+
+    def _compute(self):
+        self._stage('catalog')
+        catalog = get_catalog(CATALOG_COLUMNS, self.db_path)
+        if catalog.empty:
+            return {'status': 'empty'}
+
+        self._stage('location')
+        lat, lon, _ = load_user_location(self.db_path)
+        if lat is None:
+            return {'status': 'no_location'}
+
+        result = rank_catalog(
+            catalog, lat, lon, self.weights, db_path=self.db_path, progress=self._stage
+        )
+
+        self._stage('table')
+        # DataFrame hanya dibuat untuk tampilan
+        df = catalog.to_dataframe()
+        df['distance_km'] = result.distance
+        df['topsis_score'] = result.scores
+        df['rank'] = result.ranks
+        return {
+            'status': 'done', 'catalog': catalog, 'result': result,
+            'results': df.sort_values('rank', kind='stable'),
+        }
+
+    def run(self):
+        summary = {'generation': self.generation}
+        try:
+            summary.update(self._compute_live() if self.live else self._compute())
+        except RankingCancelled:
+            summary['status'] = 'cancelled'
+        except Exception as e:
+            summary.update(status='error', error=str(e))
+        finally:
+            close_connections(self.db_path)
+        self.completed.emit(summary)
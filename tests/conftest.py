@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+# Jalankan test dari root repo tanpa instalasi paket
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database import (  # noqa: E402
+    close_connections, init_db, invalidate_catalog_cache, upsert_wisata_rows
+)
+
+# Baris wisata (name, price, rating, rating_count, latitude, longitude)
+ROWS = [
+    ('A', 10000, 4.5, 100, -7.80, 110.36),
+    ('B', 20000, 4.0, 50, -7.81, 110.37),
+    ('C', 0, 4.8, 300, -7.82, 110.38),
+]
+
+
+@pytest.fixture
+def rows():
+    return list(ROWS)
+
+
+@pytest.fixture
+def empty_db_path(tmp_path):
+    """Database baru (skema terbaru) tanpa baris wisata."""
+    path = str(tmp_path / 'wisata.db')
+    init_db(path)
+    yield path
+    invalidate_catalog_cache(path)
+    close_connections(path)
+
+
+@pytest.fixture
+def db_path(empty_db_path):
+    """Database berisi :data:`ROWS`."""
+    upsert_wisata_rows(ROWS, empty_db_path)
+    invalidate_catalog_cache(empty_db_path)
+    return empty_db_path
@@ -0,0 +1,106 @@
+"""Test snapshot catalog saat aplikasi ditutup, migrasi skema dan upsert wisata."""
+
+import sqlite3
+
+import pytest
+
+from core.database import (
+    close_connections, count_wisata, get_catalog, get_connection, init_db,
+    save_snapshot, upsert_wisata_rows
+)
+from core.snapshot import SNAPSHOT_COLUMNS, read_manifest, snapshot_dir_for
+
+
+def test_cached_only_skips_without_cached_catalog(db_path):
+    assert save_snapshot(db_path, cached_only=True) is False
+    assert read_manifest(snapshot_dir_for(db_path)) is None
+
+
+def test_cached_only_writes_current_cached_catalog(db_path):
+    get_catalog(SNAPSHOT_COLUMNS, db_path)
+
+    assert save_snapshot(db_path, cached_only=True) is True
+    assert save_snapshot(db_path, cached_only=True) is False
+
+
+def test_cached_only_skips_stale_cached_catalog(db_path):
+    get_catalog(SNAPSHOT_COLUMNS, db_path)
+    upsert_wisata_rows([('D', 5000, 3.9, 20, -7.83, 110.39)], db_path)
+
+    assert save_snapshot(db_path, cached_only=True) is False
+
+
+@pytest.fixture
+def legacy_db_path(tmp_path, rows):
+    """Database dengan skema awal (tanpa natural key, kolom belum bertipe)."""
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE wisata (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            price REAL,
+            rating REAL,
+            rating_count REAL,
+            latitude REAL,
+            longitude REAL,
+            created_at TEXT
+        );
+        CREATE TABLE user_location (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            latitude REAL,
+            longitude REAL,
+            updated_at TEXT
+        );
+    ''')
+    conn.executemany(
+        'INSERT INTO wisata (name, price, rating, rating_count, latitude, longitude) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        rows + [
+            ('Tanpa Harga', '', 4.2, 10, -7.79, 110.35),
+            ('Rating Salah', 5000, 7.5, 10, -7.78, 110.34),
+        ]
+    )
+    conn.commit()
+    conn.close()
+    yield path
+    close_connections(path)
+
+
+def test_migrate_v2_keeps_rejected_legacy_rows(legacy_db_path, rows):
+    init_db(legacy_db_path)
+
+    assert count_wisata(db_path=legacy_db_path) == len(rows)
+    conn = sqlite3.connect(legacy_db_path)
+    rejected = conn.execute(
+        'SELECT name, price, rating FROM wisata_rejected ORDER BY id'
+    ).fetchall()
+    conn.close()
+    assert rejected == [('Tanpa Harga', '', 4.2), ('Rating Salah', 5000.0, 7.5)]
+
+
+def test_migrate_v2_skips_rejected_table_when_all_rows_valid(empty_db_path):
+    tables = {
+        name for (name,) in get_connection(empty_db_path).execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        )
+    }
+    assert 'wisata_rejected' not in tables
+
+
+def test_upsert_counts_inserted_updated_unchanged(db_path, rows):
+    changed = ('B', 25000, 4.0, 50, -7.81, 110.37)
+
+    stats = upsert_wisata_rows(
+        [rows[0], changed, ('D', 5000, 3.9, 20, -7.83, 110.39)], db_path
+    )
+
+    assert (stats['inserted'], stats['updated'], stats['unchanged']) == (1, 1, 1)
+    assert count_wisata(db_path=db_path) == len(rows) + 1
+    assert count_wisata('price = ?', (25000,), db_path=db_path) == 1
+
+
+def test_upsert_same_rows_again_changes_nothing(db_path, rows):
+    stats = upsert_wisata_rows(rows, db_path)
+
+    assert (stats['inserted'], stats['updated'], stats['unchanged']) == (0, 0, len(rows))
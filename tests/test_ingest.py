@@ -0,0 +1,63 @@
+"""Test import folder mode delta (core.ingest.ingest_directory)."""
+
+import pandas as pd
+import pytest
+
+from core.database import load_wisata_db
+from core.ingest import ingest_directory
+
+
+def write_csv(path, rows):
+    pd.DataFrame(rows, columns=[
+        'name', 'price', 'rating', 'rating_count', 'latitude', 'longitude'
+    ]).to_csv(path, index=False)
+
+
+@pytest.fixture
+def folder(tmp_path):
+    data = tmp_path / 'data'
+    data.mkdir()
+    write_csv(data / 'a.csv', [
+        ('A', 10000, 4.5, 100, -7.80, 110.36),
+        ('B', 20000, 4.0, 50, -7.81, 110.37),
+    ])
+    write_csv(data / 'b.csv', [
+        ('C', 0, 4.8, 300, -7.82, 110.38),
+        ('D', 5000, 3.9, 20, -7.83, 110.39),
+    ])
+    return data
+
+
+def stored_names(db_path):
+    return sorted(load_wisata_db(db_path)['name'])
+
+
+def test_delta_unchanged_input_writes_nothing(folder, empty_db_path):
+    ingest_directory(str(folder), empty_db_path, max_workers=1, delta=True)
+
+    stats = ingest_directory(str(folder), empty_db_path, max_workers=1, delta=True)
+
+    assert stats['inserted'] == 0
+    assert stats['updated'] == 0
+    assert stats['deleted'] == 0
+    assert stats['unchanged'] == 4
+    assert stored_names(empty_db_path) == ['A', 'B', 'C', 'D']
+
+
+def test_delta_failed_file_aborts_without_deleting(folder, empty_db_path):
+    ingest_directory(str(folder), empty_db_path, max_workers=1, delta=True)
+    (folder / 'b.csv').write_text('foo,bar\n1,2\n')
+
+    with pytest.raises(ValueError, match='b.csv'):
+        ingest_directory(str(folder), empty_db_path, max_workers=1, delta=True)
+
+    assert stored_names(empty_db_path) == ['A', 'B', 'C', 'D']
+
+
+def test_failed_file_without_delta_is_reported(folder, empty_db_path):
+    (folder / 'b.csv').write_text('foo,bar\n1,2\n')
+
+    stats = ingest_directory(str(folder), empty_db_path, max_workers=1)
+
+    assert [info['path'].endswith('b.csv') for info in stats['files'] if 'error' in info] == [True]
+    assert stored_names(empty_db_path) == ['A', 'B']
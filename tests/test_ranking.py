@@ -0,0 +1,88 @@
+"""Test pipeline ranking (lock tulis ingest, cache, skor PreparedRanking)."""
+
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from core import database
+from core.ahp import normalize_weights
+from core.database import configure_connections, get_catalog
+from core.ranking import (
+    CATALOG_COLUMNS, CRITERIA_TYPES, PreparedRanking, decision_matrix, rank_catalog,
+    ranking_cache_key
+)
+from core.topsis import topsis_rank
+
+WEIGHTS = [0.25, 0.25, 0.25, 0.25]
+
+
+@pytest.fixture(autouse=True)
+def short_busy_timeout():
+    """Batasi tunggu lock agar test yang gagal tidak menggantung 30 detik."""
+    old_timeout = database.BUSY_TIMEOUT
+    configure_connections(busy_timeout=2)
+    yield
+    configure_connections(busy_timeout=old_timeout)
+
+
+@pytest.fixture
+def writer(db_path):
+    """Koneksi lain yang memegang transaksi tulis, seperti ingest yang berjalan."""
+    conn = sqlite3.connect(db_path)
+    conn.execute('BEGIN IMMEDIATE')
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+def cached_keys(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute('SELECT cache_key FROM ranking_cache')]
+    finally:
+        conn.close()
+
+
+def test_rank_catalog_does_not_wait_for_writer(db_path, writer):
+    catalog = get_catalog(CATALOG_COLUMNS, db_path)
+
+    start = time.perf_counter()
+    result = rank_catalog(catalog, -7.80, 110.36, WEIGHTS, db_path=db_path)
+
+    assert time.perf_counter() - start < 1.0
+    assert sorted(result.ranks.tolist()) == [1, 2, 3]
+    assert not result.cached
+
+
+def test_cache_hit_does_not_wait_for_writer(db_path):
+    catalog = get_catalog(CATALOG_COLUMNS, db_path)
+    first = rank_catalog(catalog, -7.80, 110.36, WEIGHTS, db_path=db_path)
+    key = ranking_cache_key(catalog.version, WEIGHTS, -7.80, 110.36)
+    assert cached_keys(db_path) == [key]
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        start = time.perf_counter()
+        hit = rank_catalog(catalog, -7.80, 110.36, WEIGHTS, db_path=db_path)
+        assert time.perf_counter() - start < 1.0
+    finally:
+        conn.rollback()
+        conn.close()
+
+    assert hit.cached
+    np.testing.assert_array_equal(hit.ranks, first.ranks)
+
+
+@pytest.mark.parametrize('weights', [WEIGHTS, [5, 1, 2, 0], [0.1, 0.6, 0.2, 0.1]])
+def test_prepared_scores_match_topsis_rank(db_path, weights):
+    catalog = get_catalog(CATALOG_COLUMNS, db_path)
+    prepared = PreparedRanking(catalog, -7.80, 110.36)
+
+    expected = topsis_rank(
+        decision_matrix(catalog, prepared.distance), normalize_weights(weights), CRITERIA_TYPES
+    )
+
+    np.testing.assert_allclose(prepared.scores(weights), expected, rtol=1e-12)